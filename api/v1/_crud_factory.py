@@ -0,0 +1,110 @@
+"""
+Fábrica de routers CRUD
+
+Genera los endpoints POST/GET/PUT/DELETE comunes a partir de un servicio que
+sigue la convención de nombres del proyecto:
+create_<entidad>, get_<entidad>, get_all_<plural>, update_<entidad>, delete_<entidad>.
+Los métodos del servicio pueden ser síncronos (se ejecutan en el threadpool)
+o asíncronos (se esperan directamente).
+"""
+import inspect
+from typing import Any, Callable, List, Optional, Type
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi.concurrency import run_in_threadpool
+
+from auth.security import get_current_user
+from core.database import get_db
+from core.serialization import json_response
+
+async def _call(method: Callable, *args, **kwargs) -> Any:
+    """Invocar un método de servicio síncrono o asíncrono"""
+    if inspect.iscoroutinefunction(method):
+        return await method(*args, **kwargs)
+    return await run_in_threadpool(method, *args, **kwargs)
+
+def make_crud_router(
+    service: Any,
+    entity: str,
+    plural: str,
+    create_schema: Type,
+    update_schema: Type,
+    response_schema: Type,
+    not_found: str,
+    get_session: Callable = get_db,
+    auth_dep: Optional[Callable] = get_current_user,
+    on_delete: Optional[Callable[[], None]] = None
+) -> APIRouter:
+    """
+    Construir un router con los endpoints CRUD de una entidad.
+    Las rutas de detalle usan /{<entity>_id} (p. ej. /{sensor_id}) y el listado
+    acota limit a 1..1000 (422 fuera de ese rango).
+    on_delete se invoca tras cada eliminación exitosa, p. ej. para invalidar
+    datos borrados en cascada (debe ser rápido: encolar una tarea en
+    core.tasks.task_queue).
+    Uso (al final del módulo, después de las rutas específicas):
+    router.include_router(make_crud_router(sensor_service, "sensor", "sensors", ...))
+    """
+    router = APIRouter()
+    dependencies = [Depends(auth_dep)] if auth_dep else []
+    # El parámetro público conserva el nombre de la entidad (p. ej. /{sensor_id})
+    item_path = f"/{{{entity}_id}}"
+    item_id_param = Path(alias=f"{entity}_id")
+
+    create = getattr(service, f"create_{entity}")
+    get = getattr(service, f"get_{entity}")
+    get_all = getattr(service, f"get_all_{plural}", None)
+    update = getattr(service, f"update_{entity}")
+    delete = getattr(service, f"delete_{entity}")
+
+    async def create_item(data: create_schema, db=Depends(get_session)):
+        return await _call(create, db, data)
+
+    async def get_items(
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=1000),
+        db=Depends(get_session)
+    ):
+        return json_response(List[response_schema], await _call(get_all, db, skip=skip, limit=limit))
+
+    async def get_item(item_id: int = item_id_param, db=Depends(get_session)):
+        item = await _call(get, db, item_id)
+        if not item:
+            raise HTTPException(status_code=404, detail=not_found)
+        return item
+
+    async def update_item(data: update_schema, item_id: int = item_id_param, db=Depends(get_session)):
+        item = await _call(update, db, item_id, data)
+        if not item:
+            raise HTTPException(status_code=404, detail=not_found)
+        return item
+
+    async def delete_item(item_id: int = item_id_param, db=Depends(get_session)):
+        if not await _call(delete, db, item_id):
+            raise HTTPException(status_code=404, detail=not_found)
+        if on_delete is not None:
+            on_delete()
+
+    router.add_api_route(
+        "/", create_item, methods=["POST"], response_model=response_schema,
+        status_code=status.HTTP_201_CREATED, dependencies=dependencies,
+        name=f"create_{entity}", summary=f"Crear {entity}"
+    )
+    if get_all is not None:
+        router.add_api_route(
+            "/", get_items, methods=["GET"], response_model=List[response_schema],
+            dependencies=dependencies, name=f"get_all_{plural}", summary=f"Listar {plural}"
+        )
+    router.add_api_route(
+        item_path, get_item, methods=["GET"], response_model=response_schema,
+        dependencies=dependencies, name=f"get_{entity}", summary=f"Obtener {entity}"
+    )
+    router.add_api_route(
+        item_path, update_item, methods=["PUT"], response_model=response_schema,
+        dependencies=dependencies, name=f"update_{entity}", summary=f"Actualizar {entity}"
+    )
+    router.add_api_route(
+        item_path, delete_item, methods=["DELETE"], status_code=status.HTTP_204_NO_CONTENT,
+        dependencies=dependencies, name=f"delete_{entity}", summary=f"Eliminar {entity}"
+    )
+    return router
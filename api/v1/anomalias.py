@@ -2,9 +2,10 @@
 API Router para anomalías
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
+from api.v1._crud_factory import make_crud_router
 from core.database import get_db
 from auth.security import get_current_user
 from services.anomalia_service import anomalia_service
@@ -12,28 +13,6 @@ from schemas.anomalia import AnomaliaCreate, AnomaliaUpdate, AnomaliaResponse
 
 router = APIRouter(prefix="/anomalias", tags=["Anomalías"])
 
-@router.post("/", response_model=AnomaliaResponse, status_code=status.HTTP_201_CREATED)
-def create_anomalia(
-    anomalia_data: AnomaliaCreate,
-    db: Session = Depends(get_db),
-    current_user: str = Depends(get_current_user)
-):
-    """Crear una nueva anomalía"""
-    try:
-        return anomalia_service.create_anomalia(db, anomalia_data)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-
-@router.get("/", response_model=List[AnomaliaResponse])
-def get_anomalias(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
-    current_user: str = Depends(get_current_user)
-):
-    """Obtener lista de anomalías"""
-    return anomalia_service.get_all_anomalias(db, skip=skip, limit=limit)
-
 @router.get("/lectura/{lectura_id}", response_model=List[AnomaliaResponse])
 def get_anomalias_by_lectura(
     lectura_id: int,
@@ -77,10 +56,7 @@ def detect_anomalies_in_reading(
     current_user: str = Depends(get_current_user)
 ):
     """Detectar anomalías automáticamente en una lectura"""
-    try:
-        return anomalia_service.detect_anomalies_in_reading(db, lectura_id)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return anomalia_service.detect_anomalies_in_reading(db, lectura_id)
 
 @router.get("/statistics")
 def get_anomaly_statistics(
@@ -90,40 +66,10 @@ def get_anomaly_statistics(
     """Obtener estadísticas de anomalías"""
     return anomalia_service.get_anomaly_statistics(db)
 
-@router.get("/{anomalia_id}", response_model=AnomaliaResponse)
-def get_anomalia(
-    anomalia_id: int,
-    db: Session = Depends(get_db),
-    current_user: str = Depends(get_current_user)
-):
-    """Obtener una anomalía por ID"""
-    anomalia = anomalia_service.get_anomalia(db, anomalia_id)
-    if not anomalia:
-        raise HTTPException(status_code=404, detail="Anomalía no encontrada")
-    return anomalia
-
-@router.put("/{anomalia_id}", response_model=AnomaliaResponse)
-def update_anomalia(
-    anomalia_id: int,
-    anomalia_data: AnomaliaUpdate,
-    db: Session = Depends(get_db),
-    current_user: str = Depends(get_current_user)
-):
-    """Actualizar una anomalía"""
-    try:
-        anomalia = anomalia_service.update_anomalia(db, anomalia_id, anomalia_data)
-        if not anomalia:
-            raise HTTPException(status_code=404, detail="Anomalía no encontrada")
-        return anomalia
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-
-@router.delete("/{anomalia_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_anomalia(
-    anomalia_id: int,
-    db: Session = Depends(get_db),
-    current_user: str = Depends(get_current_user)
-):
-    """Eliminar una anomalía"""
-    if not anomalia_service.delete_anomalia(db, anomalia_id):
-        raise HTTPException(status_code=404, detail="Anomalía no encontrada")
+# Endpoints CRUD (POST /, GET /, GET/PUT/DELETE /{anomalia_id}); se registran al final
+# para que las rutas fijas (/recent, /critical, /statistics) tengan prioridad
+router.include_router(make_crud_router(
+    anomalia_service, "anomalia", "anomalias",
+    AnomaliaCreate, AnomaliaUpdate, AnomaliaResponse,
+    not_found="Anomalía no encontrada"
+))
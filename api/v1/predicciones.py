@@ -162,10 +162,7 @@ def create_prediccion(
     current_user: str = Depends(get_current_user)
 ):
     """Crear una nueva predicción"""
-    try:
-        return prediccion_service.create_prediccion(db, prediccion_data)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return prediccion_service.create_prediccion(db, prediccion_data)
 
 @router.get("/", response_model=List[PrediccionResponse])
 def get_predicciones(
@@ -226,12 +223,9 @@ def generate_prediction_with_ml(
     current_user: str = Depends(get_current_user)
 ):
     """Generar una predicción usando ML o lógica heurística"""
-    try:
-        return prediccion_service.generate_prediction_with_ml(
-            db, ubicacion_id, temperatura_promedio, humedad_promedio, comentario
-        )
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return prediccion_service.generate_prediction_with_ml(
+        db, ubicacion_id, temperatura_promedio, humedad_promedio, comentario
+    )
 
 @router.get("/statistics")
 def get_prediction_statistics(
@@ -261,13 +255,10 @@ def update_prediccion(
     current_user: str = Depends(get_current_user)
 ):
     """Actualizar una predicción"""
-    try:
-        prediccion = prediccion_service.update_prediccion(db, prediccion_id, prediccion_data)
-        if not prediccion:
-            raise HTTPException(status_code=404, detail="Predicción no encontrada")
-        return prediccion
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    prediccion = prediccion_service.update_prediccion(db, prediccion_id, prediccion_data)
+    if not prediccion:
+        raise HTTPException(status_code=404, detail="Predicción no encontrada")
+    return prediccion
 
 @router.delete("/{prediccion_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_prediccion(
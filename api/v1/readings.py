@@ -2,27 +2,27 @@
 API Router para lecturas
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, status
 from sqlalchemy.orm import Session
 
+from api.v1._crud_factory import make_crud_router
 from core.database import get_db
+from core.serialization import json_response
 from auth.security import get_current_user
 from services.lectura_service import lectura_service
 from schemas.lectura import LecturaCreate, LecturaUpdate, LecturaResponse
 
 router = APIRouter(prefix="/lecturas", tags=["Lecturas"])
 
-@router.post("/", response_model=LecturaResponse, status_code=status.HTTP_201_CREATED)
-def create_lectura(
-    lectura_data: LecturaCreate,
+@router.post("/bulk", response_model=List[LecturaResponse], status_code=status.HTTP_201_CREATED)
+def create_readings_bulk(
+    lecturas_data: List[LecturaCreate] = Body(..., min_length=1, max_length=1000),
     db: Session = Depends(get_db),
     current_user: str = Depends(get_current_user)
 ):
-    """Crear una nueva lectura"""
-    try:
-        return lectura_service.create_lectura(db, lectura_data)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    """Crear varias lecturas en una sola petición"""
+    lecturas = lectura_service.create_many_lecturas(db, lecturas_data)
+    return json_response(List[LecturaResponse], lecturas, status_code=status.HTTP_201_CREATED)
 
 @router.get("/sensor/{sensor_id}", response_model=List[LecturaResponse])
 def get_readings_by_sensor(
@@ -31,7 +31,7 @@ def get_readings_by_sensor(
     current_user: str = Depends(get_current_user)
 ):
     """Obtener lecturas de un sensor específico"""
-    return lectura_service.get_readings_by_sensor(db, sensor_id)
+    return json_response(List[LecturaResponse], lectura_service.get_readings_by_sensor(db, sensor_id))
 
 @router.get("/sensor/{sensor_id}/recent", response_model=List[LecturaResponse])
 def get_recent_readings(
@@ -41,45 +41,7 @@ def get_recent_readings(
     current_user: str = Depends(get_current_user)
 ):
     """Obtener lecturas recientes de un sensor"""
-    return lectura_service.get_recent_readings(db, sensor_id, hours)
-
-@router.get("/{lectura_id}", response_model=LecturaResponse)
-def get_lectura(
-    lectura_id: int,
-    db: Session = Depends(get_db),
-    current_user: str = Depends(get_current_user)
-):
-    """Obtener una lectura por ID"""
-    lectura = lectura_service.get_lectura(db, lectura_id)
-    if not lectura:
-        raise HTTPException(status_code=404, detail="Lectura no encontrada")
-    return lectura
-
-@router.put("/{lectura_id}", response_model=LecturaResponse)
-def update_lectura(
-    lectura_id: int,
-    lectura_data: LecturaUpdate,
-    db: Session = Depends(get_db),
-    current_user: str = Depends(get_current_user)
-):
-    """Actualizar una lectura"""
-    try:
-        lectura = lectura_service.update_lectura(db, lectura_id, lectura_data)
-        if not lectura:
-            raise HTTPException(status_code=404, detail="Lectura no encontrada")
-        return lectura
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-
-@router.delete("/{lectura_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_lectura(
-    lectura_id: int,
-    db: Session = Depends(get_db),
-    current_user: str = Depends(get_current_user)
-):
-    """Eliminar una lectura"""
-    if not lectura_service.delete_lectura(db, lectura_id):
-        raise HTTPException(status_code=404, detail="Lectura no encontrada")
+    return json_response(List[LecturaResponse], lectura_service.get_recent_readings(db, sensor_id, hours))
 
 @router.get("/sensor/{sensor_id}/stats")
 def get_sensor_stats(
@@ -89,3 +51,10 @@ def get_sensor_stats(
 ):
     """Obtener estadísticas de un sensor"""
     return lectura_service.get_sensor_stats(db, sensor_id)
+
+# Endpoints CRUD (POST /, GET/PUT/DELETE /{lectura_id})
+router.include_router(make_crud_router(
+    lectura_service, "lectura", "lecturas",
+    LecturaCreate, LecturaUpdate, LecturaResponse,
+    not_found="Lectura no encontrada"
+))
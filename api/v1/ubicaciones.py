@@ -1,102 +1,148 @@
 """
 API Router para ubicaciones
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+import hashlib
+from typing import List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from core.database import get_db
+from core.cache import UBICACIONES_CACHE_NAMESPACE, cached, response_cache
+from core.database import get_async_db, get_async_sessionmaker
+from core.serialization import dump_json, json_response
+from core.tasks import task_queue
 from auth.security import get_current_user
 from services.ubicacion_service import ubicacion_service
 from schemas.ubicacion import UbicacionCreate, UbicacionUpdate, UbicacionResponse
 
 router = APIRouter(prefix="/ubicaciones", tags=["Ubicaciones"])
 
+def _etag(ubicacion) -> str:
+    """ETag débil a partir del ID y la fecha de última modificación (sin serializar)"""
+    version = f"{ubicacion.id}:{ubicacion.updated_at.isoformat() if ubicacion.updated_at else ''}"
+    return f'W/"{hashlib.blake2b(version.encode(), digest_size=8).hexdigest()}"'
+
 @router.post("/", response_model=UbicacionResponse, status_code=status.HTTP_201_CREATED)
-def create_ubicacion(
+async def create_ubicacion(
     ubicacion_data: UbicacionCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: str = Depends(get_current_user)
 ):
     """Crear una nueva ubicación"""
-    try:
-        return ubicacion_service.create_ubicacion(db, ubicacion_data)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    ubicacion = await ubicacion_service.create_ubicacion(db, ubicacion_data)
+    task_queue.submit_idempotent(response_cache.clear, UBICACIONES_CACHE_NAMESPACE)
+    return ubicacion
+
+@router.post("/bulk", response_model=List[UbicacionResponse], status_code=status.HTTP_201_CREATED)
+async def create_ubicaciones_bulk(
+    ubicaciones_data: List[UbicacionCreate] = Body(..., min_length=1, max_length=1000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Crear varias ubicaciones en una sola petición"""
+    ubicaciones = await ubicacion_service.create_many_ubicaciones(db, ubicaciones_data)
+    task_queue.submit_idempotent(response_cache.clear, UBICACIONES_CACHE_NAMESPACE)
+    return json_response(List[UbicacionResponse], ubicaciones, status_code=status.HTTP_201_CREATED)
 
 @router.get("/", response_model=List[UbicacionResponse])
-def get_ubicaciones(
+@cached(UBICACIONES_CACHE_NAMESPACE, List[UbicacionResponse])
+async def get_ubicaciones(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    after_id: Optional[int] = Query(None, ge=0, description="Último ID recibido (paginación por clave)"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: str = Depends(get_current_user)
 ):
     """Obtener lista de ubicaciones"""
-    return ubicacion_service.get_all_ubicaciones(db, skip=skip, limit=limit)
+    return await ubicacion_service.get_all_ubicaciones(db, skip=skip, limit=limit, after_id=after_id)
+
+@router.get("/export")
+async def export_ubicaciones(
+    session_factory: async_sessionmaker = Depends(get_async_sessionmaker),
+    current_user: str = Depends(get_current_user)
+):
+    """Exportar todas las ubicaciones como NDJSON (una ubicación por línea)"""
+    async def generate():
+        # Sesión propia: debe seguir abierta mientras se envía la respuesta
+        async with session_factory() as db:
+            async for ubicacion in ubicacion_service.stream_ubicaciones(db):
+                yield dump_json(UbicacionResponse, ubicacion) + b"\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 @router.get("/sensor/{sensor_id}", response_model=List[UbicacionResponse])
-def get_ubicaciones_by_sensor(
+async def get_ubicaciones_by_sensor(
     sensor_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: str = Depends(get_current_user)
 ):
     """Obtener ubicaciones de un sensor específico"""
-    return ubicacion_service.get_ubicaciones_by_sensor(db, sensor_id)
+    ubicaciones = await ubicacion_service.get_ubicaciones_by_sensor(db, sensor_id)
+    return json_response(List[UbicacionResponse], ubicaciones)
 
 @router.get("/search", response_model=List[UbicacionResponse])
-def search_ubicaciones(
+@cached(UBICACIONES_CACHE_NAMESPACE, List[UbicacionResponse])
+async def search_ubicaciones(
     q: str = Query(..., min_length=1, description="Término de búsqueda"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: str = Depends(get_current_user)
 ):
     """Buscar ubicaciones por descripción"""
-    return ubicacion_service.search_ubicaciones(db, q)
+    return await ubicacion_service.search_ubicaciones(db, q)
 
 @router.get("/nearby", response_model=List[UbicacionResponse])
-def get_nearby_ubicaciones(
-    latitud: str = Query(..., description="Latitud base"),
-    longitud: str = Query(..., description="Longitud base"),
+@cached(UBICACIONES_CACHE_NAMESPACE, List[UbicacionResponse])
+async def get_nearby_ubicaciones(
+    latitud: float = Query(..., ge=-90, le=90, description="Latitud base"),
+    longitud: float = Query(..., ge=-180, le=180, description="Longitud base"),
     radio: float = Query(0.01, ge=0.001, le=1.0, description="Radio de búsqueda"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: str = Depends(get_current_user)
 ):
     """Obtener ubicaciones cercanas a unas coordenadas"""
-    return ubicacion_service.get_nearby_locations(db, latitud, longitud, radio)
+    return await ubicacion_service.get_nearby_locations(db, latitud, longitud, radio)
 
 @router.get("/{ubicacion_id}", response_model=UbicacionResponse)
-def get_ubicacion(
+async def get_ubicacion(
     ubicacion_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     current_user: str = Depends(get_current_user)
 ):
-    """Obtener una ubicación por ID"""
-    ubicacion = ubicacion_service.get_ubicacion(db, ubicacion_id)
+    """Obtener una ubicación por ID (con ETag: responde 304 si no ha cambiado)"""
+    ubicacion = await ubicacion_service.get_ubicacion(db, ubicacion_id)
     if not ubicacion:
         raise HTTPException(status_code=404, detail="Ubicación no encontrada")
-    return ubicacion
+    
+    headers = {"ETag": _etag(ubicacion), "Cache-Control": "max-age=1"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response = json_response(UbicacionResponse, ubicacion)
+    response.headers.update(headers)
+    return response
 
 @router.put("/{ubicacion_id}", response_model=UbicacionResponse)
-def update_ubicacion(
+async def update_ubicacion(
     ubicacion_id: int,
     ubicacion_data: UbicacionUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: str = Depends(get_current_user)
 ):
     """Actualizar una ubicación"""
-    try:
-        ubicacion = ubicacion_service.update_ubicacion(db, ubicacion_id, ubicacion_data)
-        if not ubicacion:
-            raise HTTPException(status_code=404, detail="Ubicación no encontrada")
-        return ubicacion
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    ubicacion = await ubicacion_service.update_ubicacion(db, ubicacion_id, ubicacion_data)
+    if not ubicacion:
+        raise HTTPException(status_code=404, detail="Ubicación no encontrada")
+    task_queue.submit_idempotent(response_cache.clear, UBICACIONES_CACHE_NAMESPACE)
+    return ubicacion
 
 @router.delete("/{ubicacion_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_ubicacion(
+async def delete_ubicacion(
     ubicacion_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: str = Depends(get_current_user)
 ):
     """Eliminar una ubicación"""
-    if not ubicacion_service.delete_ubicacion(db, ubicacion_id):
+    if not await ubicacion_service.delete_ubicacion(db, ubicacion_id):
         raise HTTPException(status_code=404, detail="Ubicación no encontrada")
+    task_queue.submit_idempotent(response_cache.clear, UBICACIONES_CACHE_NAMESPACE)
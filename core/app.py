@@ -7,29 +7,45 @@ from contextlib import asynccontextmanager
 import logging
 
 from core.settings import get_settings
+from core.logging_config import setup_logging
 from core.database import create_tables
+from core.cache import response_cache
+from core.tasks import task_queue
+from core.exceptions import register_exception_handlers
+from core.middleware import SingleFlightMiddleware
 from api.v1.router import api_router
 from auth.router import router as auth_router 
 
 
 # Configuración de logging
-logging.basicConfig(level=logging.INFO)
+setup_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Endpoints de lectura cuyas peticiones idénticas concurrentes se agrupan
+SINGLE_FLIGHT_PATHS = (
+    "/api/v1/ubicaciones/",
+    "/api/v1/ubicaciones/search",
+    "/api/v1/ubicaciones/nearby",
+)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gestiona el ciclo de vida de la aplicación"""
     # Startup
     logger.info("Iniciando aplicación...")
     create_tables()
+    response_cache.init(settings.REDIS_URL)
+    task_queue.start(settings.TASK_WORKERS)
     logger.info("Aplicación iniciada correctamente")
     
     yield
     
     # Shutdown
     logger.info("Cerrando aplicación...")
+    await task_queue.stop()
+    await response_cache.close()
 
 def create_app() -> FastAPI:
     """Factory para crear la aplicación FastAPI"""
@@ -41,6 +57,10 @@ def create_app() -> FastAPI:
         lifespan=lifespan
     )
 
+    # Agrupar peticiones GET idénticas en curso (una sola consulta a la BD);
+    # se registra antes que CORS para que CORS quede por fuera y responda a cada origen
+    app.add_middleware(SingleFlightMiddleware, paths=SINGLE_FLIGHT_PATHS)
+
     # Configuración de CORS
     app.add_middleware(
         CORSMiddleware,
@@ -50,6 +70,9 @@ def create_app() -> FastAPI:
         allow_headers=settings.ALLOWED_HEADERS,
     )
 
+    # Manejo centralizado de errores (ValueError -> 400, BD/no controlados -> 500)
+    register_exception_handlers(app)
+
     # Incluir routers
     app.include_router(api_router, prefix="/api/v1")
     app.include_router(auth_router, prefix="/auth")
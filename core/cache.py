@@ -0,0 +1,148 @@
+"""
+Cache de respuestas HTTP (Redis o memoria del proceso)
+
+Se guarda el cuerpo JSON ya serializado, de modo que un acierto de cache
+no consulta la base de datos ni vuelve a validar con Pydantic.
+"""
+import functools
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Response
+
+from core.serialization import dump_json
+
+logger = logging.getLogger(__name__)
+
+# Namespaces de cache compartidos entre routers
+UBICACIONES_CACHE_NAMESPACE = "ubicaciones"
+
+# Parámetros de los endpoints que no forman parte de la clave de cache
+NON_KEY_PARAMS = frozenset({"db", "current_user", "token", "service"})
+
+# Entradas máximas del backend en memoria (las claves incluyen parámetros libres)
+MEMORY_CACHE_SIZE = 1024
+
+class InMemoryBackend:
+    """Backend en memoria (por defecto, un cache por proceso, acotado a max_entries)"""
+
+    def __init__(self, max_entries: int = MEMORY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._store: Dict[str, Tuple[float, bytes]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._store.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, expire: int):
+        now = time.monotonic()
+        if key not in self._store and len(self._store) >= self.max_entries:
+            self._evict(now)
+        # Reinsertar al final: el orden del dict es el orden de antigüedad
+        self._store.pop(key, None)
+        self._store[key] = (now + expire, value)
+
+    def _evict(self, now: float):
+        """Eliminar las entradas expiradas y, si no basta, las más antiguas (deja un 10% libre)"""
+        for key in [k for k, (expires_at, _) in self._store.items() if expires_at < now]:
+            del self._store[key]
+        target = self.max_entries - max(1, self.max_entries // 10)
+        while len(self._store) > target:
+            del self._store[next(iter(self._store))]
+
+    async def clear(self, prefix: str):
+        for key in [k for k in self._store if k.startswith(prefix)]:
+            del self._store[key]
+
+    async def close(self):
+        self._store.clear()
+
+class RedisBackend:
+    """Backend Redis (compartido entre procesos/réplicas)"""
+
+    def __init__(self, url: str):
+        from redis import asyncio as aioredis
+        self.redis = aioredis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.redis.get(key)
+
+    async def set(self, key: str, value: bytes, expire: int):
+        await self.redis.set(key, value, ex=expire)
+
+    async def clear(self, prefix: str):
+        keys = [key async for key in self.redis.scan_iter(match=f"{prefix}*")]
+        if keys:
+            await self.redis.delete(*keys)
+
+    async def close(self):
+        await self.redis.aclose()
+
+class ResponseCache:
+    """Cache de respuestas organizado por namespaces"""
+
+    def __init__(self, prefix: str = "sensores-cache"):
+        self.prefix = prefix
+        self.backend = InMemoryBackend()
+
+    def init(self, redis_url: Optional[str] = None):
+        """Selecciona el backend: Redis si hay URL configurada, si no memoria"""
+        if redis_url:
+            self.backend = RedisBackend(redis_url)
+            logger.info("Cache de respuestas usando Redis")
+        else:
+            self.backend = InMemoryBackend()
+            logger.info("Cache de respuestas en memoria")
+
+    def _key(self, namespace: str, key: str = "") -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    async def get(self, namespace: str, key: str) -> Optional[bytes]:
+        return await self.backend.get(self._key(namespace, key))
+
+    async def set(self, namespace: str, key: str, value: bytes, expire: int):
+        await self.backend.set(self._key(namespace, key), value, expire)
+
+    async def clear(self, namespace: str):
+        """Invalida todas las respuestas de un namespace"""
+        await self.backend.clear(self._key(namespace))
+
+    async def close(self):
+        await self.backend.close()
+
+# Instancia global del cache
+response_cache = ResponseCache()
+
+def cached(namespace: str, response_model: Any, expire: int = 30) -> Callable:
+    """
+    Decorador para endpoints GET asíncronos.
+    La clave se construye con los parámetros de la petición (sin sesión ni usuario).
+    Uso:
+    @router.get("/", response_model=List[X])
+    @cached("x", List[X])
+    async def get_x(...): ...
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            params = ",".join(
+                f"{name}={kwargs[name]!r}" for name in sorted(kwargs) if name not in NON_KEY_PARAMS
+            )
+            key = f"{func.__name__}:{params}"
+
+            body = await response_cache.get(namespace, key)
+            if body is None:
+                result = await func(*args, **kwargs)
+                body = dump_json(response_model, result)
+                await response_cache.set(namespace, key, body, expire)
+
+            return Response(content=body, media_type="application/json")
+        return wrapper
+    return decorator
@@ -1,11 +1,14 @@
 """
 Configuración de la base de datos centralizada
 """
-from sqlalchemy import create_engine
+from sqlalchemy import String, create_engine, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
-from typing import Generator
+from typing import AsyncGenerator, Generator
 import logging
 
 from core.settings import get_settings
@@ -16,17 +19,63 @@ settings = get_settings()
 # Base declarativa para todos los modelos
 Base = declarative_base()
 
+def get_engine_options(database_url: str, pool_size: int, max_overflow: int) -> dict:
+    """Opciones comunes del engine (pool de conexiones incluido)"""
+    options = {
+        "echo": settings.DEBUG,                     # Muestra queries SQL si DEBUG=True
+        "pool_pre_ping": True,                      # Verifica conexiones
+        "pool_recycle": settings.DB_POOL_RECYCLE,   # Recicla conexiones cada hora
+    }
+    # SQLite no usa un QueuePool dimensionable (p. ej. ":memory:")
+    if make_url(database_url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
+
 # Engine de SQLAlchemy
 engine = create_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,  # Muestra queries SQL si DEBUG=True
-    pool_pre_ping=True,   # Verifica conexiones
-    pool_recycle=3600     # Recicla conexiones cada hora
+    **get_engine_options(settings.DATABASE_URL, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
 )
 
 # Sesión local
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Drivers asíncronos equivalentes a los drivers síncronos soportados
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def get_async_database_url(database_url: str) -> str:
+    """Convierte una URL de base de datos síncrona a su driver asíncrono"""
+    url = make_url(database_url)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+def get_async_connect_args(async_database_url: str) -> dict:
+    """Argumentos de conexión del driver asíncrono"""
+    # asyncpg prepara cada sentencia una vez por conexión y reutiliza el plan;
+    # las consultas del ORM ya usan parámetros ligados, así que el SQL es estable
+    if make_url(async_database_url).drivername == "postgresql+asyncpg":
+        return {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return {}
+
+# Engine asíncrono (misma base de datos, driver asyncpg/aiosqlite)
+ASYNC_DATABASE_URL = get_async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    connect_args=get_async_connect_args(ASYNC_DATABASE_URL),
+    **get_engine_options(settings.DATABASE_URL, settings.DB_ASYNC_POOL_SIZE, settings.DB_ASYNC_MAX_OVERFLOW)
+)
+
+# Sesión asíncrona
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependencia para obtener sesión de base de datos
@@ -38,6 +87,22 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependencia para obtener sesión asíncrona de base de datos
+    Uso: db: AsyncSession = Depends(get_async_db)
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """
+    Dependencia para endpoints que abren sus propias sesiones asíncronas
+    (p. ej. respuestas en streaming que siguen leyendo tras devolver el endpoint)
+    Uso: session_factory: async_sessionmaker = Depends(get_async_sessionmaker)
+    """
+    return AsyncSessionLocal
+
 @contextmanager
 def get_db_context() -> Generator[Session, None, None]:
     """
@@ -58,6 +123,39 @@ def create_tables():
     Base.metadata.create_all(bind=engine)
     logger.info("Tablas creadas exitosamente")
 
+def upgrade_schema(bind: Engine = engine):
+    """
+    Actualiza tablas ya existentes (create_all solo crea las que faltan).
+    Idempotente: se ejecuta en cada `manage.py migrate`.
+    - ubicaciones.latitud/longitud pasan de texto a double precision
+    - índice compuesto ix_ubicaciones_latitud_longitud
+    """
+    table = Base.metadata.tables.get("ubicaciones")
+    if table is None or not inspect(bind).has_table("ubicaciones"):
+        return
+    
+    columns = {column["name"]: column["type"] for column in inspect(bind).get_columns("ubicaciones")}
+    text_columns = [name for name in ("latitud", "longitud") if isinstance(columns.get(name), String)]
+    if text_columns:
+        if bind.dialect.name == "postgresql":
+            with bind.begin() as conn:
+                for name in text_columns:
+                    conn.execute(text(
+                        f"ALTER TABLE ubicaciones ALTER COLUMN {name} "
+                        f"TYPE double precision USING {name}::double precision"
+                    ))
+            logger.info("Columnas %s de ubicaciones convertidas a double precision", ", ".join(text_columns))
+        else:
+            # SQLite no permite cambiar el tipo de una columna: hay que recrear la tabla
+            logger.warning(
+                "Las columnas %s de ubicaciones siguen siendo texto; recree la base de datos "
+                "(DatabaseManager.reset_database) para usar coordenadas numéricas",
+                ", ".join(text_columns)
+            )
+    
+    for index in table.indexes:
+        index.create(bind=bind, checkfirst=True)
+
 def drop_tables():
     """Elimina todas las tablas (útil para pruebas)"""
     logger.warning("Eliminando todas las tablas...")
@@ -0,0 +1,43 @@
+"""
+Manejadores de excepciones centralizados
+
+Los servicios señalan errores de validación con ValueError; aquí se traducen a
+respuestas HTTP una sola vez, en lugar de repetir try/except en cada endpoint.
+"""
+import logging
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+logger = logging.getLogger(__name__)
+
+async def value_error_handler(request: Request, exc: ValueError) -> JSONResponse:
+    """Errores de validación de negocio -> 400"""
+    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
+
+async def database_error_handler(request: Request, exc: SQLAlchemyError) -> JSONResponse:
+    """Errores de base de datos -> 500 (sin exponer el detalle al cliente)"""
+    logger.error("Error de base de datos en %s %s: %s", request.method, request.url.path, exc)
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": "Error de base de datos"}
+    )
+
+async def unhandled_error_handler(request: Request, exc: Exception) -> JSONResponse:
+    """Cualquier otro error no controlado -> 500"""
+    logger.exception("Error no controlado en %s %s", request.method, request.url.path)
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": "Error interno del servidor"}
+    )
+
+def register_exception_handlers(app: FastAPI):
+    """Registrar los manejadores de excepciones en la aplicación"""
+    # pydantic.ValidationError hereda de ValueError: dentro de un endpoint indica
+    # un error interno (p. ej. validar una respuesta), no una petición inválida
+    app.add_exception_handler(ValidationError, unhandled_error_handler)
+    app.add_exception_handler(ValueError, value_error_handler)
+    app.add_exception_handler(SQLAlchemyError, database_error_handler)
+    app.add_exception_handler(Exception, unhandled_error_handler)
@@ -0,0 +1,33 @@
+"""
+Configuración de logging
+
+Los registros se encolan con un QueueHandler y un QueueListener los escribe
+desde un hilo propio, de modo que la escritura (I/O) no bloquea el event loop.
+"""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_FORMAT = "%(levelname)s:%(name)s:%(message)s"
+
+_listener: Optional[QueueListener] = None
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """Configura el logger raíz con un handler en cola (idempotente)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
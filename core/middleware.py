@@ -0,0 +1,65 @@
+"""
+Middlewares ASGI de la aplicación
+"""
+import asyncio
+from typing import Dict, Iterable, List, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+class SingleFlightMiddleware:
+    """
+    Agrupa peticiones GET idénticas que llegan mientras otra igual está en curso.
+    Solo la primera (líder) ejecuta el endpoint; las demás esperan y reciben una
+    copia de su respuesta. La clave incluye ruta, query ordenada y cabecera
+    Authorization, de modo que cada credencial se valida por separado.
+    Solo debe aplicarse a rutas de lectura con respuestas pequeñas (se guardan en memoria).
+    """
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str] = ()):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.inflight: Dict[tuple, asyncio.Future] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "GET" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        key = self._key(scope)
+        leader = self.inflight.get(key)
+        if leader is not None:
+            # shield: cancelar a un seguidor no debe cancelar el Future compartido
+            messages = await asyncio.shield(leader)
+            if messages is not None:
+                for message in messages:
+                    await send(message)
+                return
+            # El líder falló o fue cancelado: esta petición se atiende por su cuenta
+            await self.app(scope, receive, send)
+            return
+
+        # No hay await entre la consulta y el registro, así que no hace falta un lock
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        messages: List[Message] = []
+
+        async def send_and_capture(message: Message):
+            messages.append(message)
+            await send(message)
+
+        result: Optional[List[Message]] = None
+        try:
+            await self.app(scope, receive, send_and_capture)
+            result = messages
+        finally:
+            del self.inflight[key]
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _key(scope: Scope) -> tuple:
+        query = b"&".join(sorted(scope["query_string"].split(b"&")))
+        authorization = next(
+            (value for name, value in scope["headers"] if name == b"authorization"), b""
+        )
+        return scope["path"], query, authorization
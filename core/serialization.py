@@ -0,0 +1,26 @@
+"""
+Serialización JSON de respuestas con Pydantic (núcleo en Rust)
+
+Los TypeAdapter se construyen una sola vez por modelo y se reutilizan; los
+endpoints de listado devuelven directamente los bytes JSON, sin pasar por
+jsonable_encoder ni por una segunda validación del response_model.
+"""
+import functools
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+@functools.lru_cache(maxsize=None)
+def get_adapter(response_model: Any) -> TypeAdapter:
+    """TypeAdapter cacheado para un modelo o tipo (p. ej. List[X])"""
+    return TypeAdapter(response_model)
+
+def dump_json(response_model: Any, data: Any) -> bytes:
+    """Validar (desde atributos ORM o filas) y serializar a JSON"""
+    adapter = get_adapter(response_model)
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+def json_response(response_model: Any, data: Any, status_code: int = 200) -> Response:
+    """Respuesta JSON ya serializada"""
+    return Response(content=dump_json(response_model, data), status_code=status_code, media_type="application/json")
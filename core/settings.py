@@ -42,6 +42,24 @@ class Settings(BaseSettings):
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./test.db")
     TEST_DATABASE_URL: Optional[str] = os.getenv("TEST_DATABASE_URL")
     
+    # Pools de conexiones: el engine síncrono y el asíncrono tienen cada uno el
+    # suyo, así que cada proceso abre hasta la suma de ambos (10+5 + 10+5 = 30)
+    DB_POOL_SIZE: int = int(os.getenv("SQLALCHEMY_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW: int = int(os.getenv("SQLALCHEMY_MAX_OVERFLOW", 5))
+    DB_ASYNC_POOL_SIZE: int = int(os.getenv("SQLALCHEMY_ASYNC_POOL_SIZE", 10))
+    DB_ASYNC_MAX_OVERFLOW: int = int(os.getenv("SQLALCHEMY_ASYNC_MAX_OVERFLOW", 5))
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 3600
+    
+    # Sentencias preparadas que asyncpg guarda por conexión (PostgreSQL)
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("SQLALCHEMY_STATEMENT_CACHE_SIZE", 256))
+    
+    # Cache de respuestas (Redis opcional; sin URL se usa memoria del proceso)
+    REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
+    
+    # Workers de la cola de tareas en segundo plano
+    TASK_WORKERS: int = 4
+    
     # Seguridad
     SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
     JWT_ALGORITHM: str = "HS256"
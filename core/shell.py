@@ -12,10 +12,10 @@ def interactive_shell():
     print("=== Shell Interactivo del Proyecto Sensores ===")
     print("Objetos disponibles:")
     print("  - db: contexto de base de datos")
-    print("  - sensor_service: servicio de sensores")
+    print("  - sensor_service: servicio de sensores (asíncrono, usa AsyncSession)")
     print("  - lectura_service: servicio de lecturas")
     print("  - Modelos: Sensor, Lectura, etc.")
-    print("Ejemplo: sensor_service.get_all_sensors(db)")
+    print("Ejemplo: lectura_service.get_readings_by_sensor(db, 1)")
     
     import IPython
     with get_db_context() as db:
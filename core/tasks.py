@@ -0,0 +1,143 @@
+"""
+Cola persistente de tareas en segundo plano
+
+Los efectos secundarios posteriores a una escritura (p. ej. invalidar el cache)
+se encolan y los procesan workers lanzados al iniciar la aplicación, en lugar de
+ejecutarse como BackgroundTasks al final de cada petición.
+"""
+import asyncio
+import functools
+import inspect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Any, Callable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Máximo de tareas que un worker toma de la cola de una vez
+BATCH_SIZE = 128
+
+class TaskQueue:
+    """Cola asyncio con workers persistentes"""
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Tareas lanzadas sin cola (referencias fuertes hasta que terminan)
+        self._detached: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._queue is not None
+
+    def start(self, workers: int = 4):
+        """Inicia los workers (llamar desde el lifespan de la aplicación)"""
+        self._queue = asyncio.Queue()
+        # Las tareas síncronas (CPU o I/O bloqueante) se ejecutan en un pool de hilos
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tasks")
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(workers)]
+        logger.info("Cola de tareas iniciada con %s workers", workers)
+
+    async def stop(self):
+        """Procesa las tareas pendientes y detiene los workers"""
+        if self._queue is None:
+            return
+        await self._queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        for worker in self._workers:
+            with suppress(asyncio.CancelledError):
+                await worker
+        self._executor.shutdown(wait=True)
+        self._queue = None
+        self._workers = []
+        self._executor = None
+        logger.info("Cola de tareas detenida")
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs):
+        """
+        Encola una tarea sin bloquear la petición (acepta funciones async o sync).
+        Las tareas son de mejor esfuerzo: si la cola no está iniciada (fuera del
+        lifespan) se ejecutan directamente en lugar de hacer fallar la petición.
+        Cada llamada se ejecuta una vez; para tareas idempotentes que pueden
+        agruparse, usar submit_idempotent.
+        """
+        self._enqueue(func, args, kwargs, coalesce=False)
+
+    def submit_idempotent(self, func: Callable[..., Any], *args, **kwargs):
+        """
+        Como submit, pero la tarea puede descartarse si otra idéntica (misma
+        función y argumentos) llega en el mismo lote. Solo para trabajo
+        idempotente, p. ej. response_cache.clear(namespace).
+        """
+        self._enqueue(func, args, kwargs, coalesce=True)
+
+    def _enqueue(self, func: Callable[..., Any], args: tuple, kwargs: dict, coalesce: bool):
+        if self._queue is None:
+            self._run_unqueued(func, args, kwargs)
+            return
+        self._queue.put_nowait((func, args, kwargs, coalesce))
+
+    def _run_unqueued(self, func: Callable[..., Any], args: tuple, kwargs: dict):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            task = loop.create_task(self._run(func, args, kwargs))
+            self._detached.add(task)
+            task.add_done_callback(self._detached.discard)
+        elif not inspect.iscoroutinefunction(func):
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                logger.exception("Error ejecutando tarea %r", func)
+        else:
+            logger.warning("Cola de tareas no iniciada: se omite la tarea %r", func)
+
+    async def _worker(self):
+        while True:
+            batch = [await self._queue.get()]
+            # Tomar lo que ya esté encolado (sin esperar) para procesarlo en bloque
+            while len(batch) < BATCH_SIZE and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                for func, args, kwargs, _ in _coalesce(batch):
+                    await self._run(func, args, kwargs)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _run(self, func: Callable[..., Any], args: tuple, kwargs: dict):
+        try:
+            if inspect.iscoroutinefunction(func):
+                await func(*args, **kwargs)
+            else:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        except Exception:
+            logger.exception("Error ejecutando tarea en segundo plano %r", func)
+
+def _coalesce(batch: List[tuple]) -> List[tuple]:
+    """Eliminar tareas idempotentes idénticas repetidas en un lote (p. ej. invalidar el mismo namespace)"""
+    unique, seen = [], set()
+    for job in batch:
+        func, args, kwargs, coalesce = job
+        if not coalesce:
+            unique.append(job)
+            continue
+        try:
+            key = (func, args, frozenset(kwargs.items()))
+            if key in seen:
+                continue
+            seen.add(key)
+        except TypeError:
+            # Argumentos no hashables: la tarea se ejecuta siempre
+            pass
+        unique.append(job)
+    return unique
+
+# Instancia global de la cola
+task_queue = TaskQueue()
@@ -24,13 +24,13 @@ def ejemplo_uso_nuevo():
     """Ejemplo de cómo se hace en la nueva estructura"""
     print("✅ NUEVA ESTRUCTURA - Ejemplo de uso:")
     print("   # Para crear un sensor, ahora solo necesitas:")
-    print("   from core.database import get_db_context")
+    print("   from core.database import AsyncSessionLocal")
     print("   from services.sensor_service import sensor_service")
     print("   from schemas.sensor import SensorCreate")
     print("")
-    print("   # Código más limpio y simple:")
-    print("   with get_db_context() as db:")
-    print("       sensor = sensor_service.create_sensor(db, SensorCreate(...))")
+    print("   # Código más limpio y simple (SensorService es asíncrono):")
+    print("   async with AsyncSessionLocal() as db:")
+    print("       sensor = await sensor_service.create_sensor(db, SensorCreate(...))")
     print("")
 
 def ejemplo_api_anterior():
@@ -56,16 +56,14 @@ def ejemplo_api_nuevo():
     print("✅ ENDPOINT NUEVO:")
     print("""
     @router.post("/", response_model=SensorResponse)
-    def create_sensor(
+    async def create_sensor(
         sensor_data: SensorCreate,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         current_user: str = Depends(get_current_user)
     ):
-        # Lógica centralizada en el servicio
-        try:
-            return sensor_service.create_sensor(db, sensor_data)
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
+        # Lógica centralizada en el servicio; los ValueError se traducen
+        # a 400 en core/exceptions.py
+        return await sensor_service.create_sensor(db, sensor_data)
     """)
 
 def ejemplo_testing_anterior():
@@ -29,8 +29,10 @@ def main():
         from core.testing import run_tests
         run_tests()
     elif command == "migrate":
-        from core.database import create_tables
+        import models  # registra los modelos en Base.metadata
+        from core.database import create_tables, upgrade_schema
         create_tables()
+        upgrade_schema()
     elif command == "shell":
         from core.shell import interactive_shell
         interactive_shell()
@@ -1,7 +1,7 @@
 """
 Modelo de Ubicación
 """
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, Float, String, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from models.base import BaseModel
@@ -10,13 +10,16 @@ class Ubicacion(BaseModel):
     __tablename__ = "ubicaciones"
     
     sensor_id = Column(Integer, ForeignKey("sensores.id"), nullable=False)
-    latitud = Column(String, nullable=False)
-    longitud = Column(String, nullable=False)
+    latitud = Column(Float, nullable=False)
+    longitud = Column(Float, nullable=False)
     descripcion = Column(String, nullable=True)
     
     # Relaciones
     sensor = relationship("Sensor", back_populates="ubicaciones")
     predicciones = relationship("PrediccionSequia", back_populates="ubicacion", cascade="all, delete-orphan")
     
+    # Búsquedas por coordenadas (duplicados y cercanía)
+    __table_args__ = (Index("ix_ubicaciones_latitud_longitud", "latitud", "longitud"),)
+    
     def __repr__(self):
         return f"<Ubicacion(id={self.id}, lat={self.latitud}, lng={self.longitud})>"
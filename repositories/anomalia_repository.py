@@ -58,5 +58,19 @@ class AnomaliaRepository(CRUDRepository[Anomalia]):
         
         return {tipo: count for tipo, count in result}
 
+    def get_statistics(self, db: Session, hours: int = 24, threshold: float = 50.0) -> dict:
+        """Contar total, recientes y críticas en una sola consulta agregada"""
+        from sqlalchemy import func
+        
+        cutoff_date = datetime.now(UTC) - timedelta(hours=hours)
+        
+        total, recientes, criticas = db.query(
+            func.count(Anomalia.id),
+            func.count(Anomalia.id).filter(Anomalia.created_at >= cutoff_date),
+            func.count(Anomalia.id).filter(Anomalia.valor >= threshold)
+        ).one()
+        
+        return {"total": total, "recientes": recientes, "criticas": criticas}
+
 # Instancia global del repositorio
 anomalia_repository = AnomaliaRepository()
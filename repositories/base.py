@@ -1,7 +1,8 @@
 """
 Repositorio genérico que implementa CRUD básico
 """
-from typing import Generic, TypeVar, Type, List, Optional, Dict, Any
+from typing import Generic, TypeVar, Type, List, Optional, Dict, Any, Set
+from sqlalchemy import insert, literal, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 import logging
@@ -15,6 +16,9 @@ ModelType = TypeVar("ModelType", bound=BaseModel)
 class CRUDRepository(Generic[ModelType]):
     """Repositorio CRUD genérico"""
     
+    # Opciones de carga aplicadas a los listados (p. ej. raiseload para detectar N+1)
+    list_options: tuple = ()
+    
     def __init__(self, model: Type[ModelType]):
         self.model = model
     
@@ -25,20 +29,38 @@ class CRUDRepository(Generic[ModelType]):
             db.add(db_obj)
             db.commit()
             db.refresh(db_obj)
-            logger.info(f"Creado {self.model.__name__} con ID {db_obj.id}")
+            logger.info("Creado %s con ID %s", self.model.__name__, db_obj.id)
             return db_obj
         except SQLAlchemyError as e:
             db.rollback()
-            logger.error(f"Error creando {self.model.__name__}: {e}")
+            logger.error("Error creando %s: %s", self.model.__name__, e)
+            raise
+    
+    def create_many(self, db: Session, items: List[Dict[str, Any]]) -> List[ModelType]:
+        """Crear varias instancias con un único INSERT ... RETURNING (en el orden de items)"""
+        try:
+            statement = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+            db_objs = list(db.scalars(statement, items))
+            db.commit()
+            logger.info("Creados %s %s", len(db_objs), self.model.__name__)
+            return db_objs
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error("Error creando %s: %s", self.model.__name__, e)
             raise
     
     def get_by_id(self, db: Session, id: int) -> Optional[ModelType]:
         """Obtener por ID"""
         return db.query(self.model).filter(self.model.id == id).first()
     
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[ModelType]:
-        """Obtener todos con paginación"""
-        return db.query(self.model).offset(skip).limit(limit).all()
+    def get_all(self, db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[ModelType]:
+        """Obtener todos con paginación (keyset si se indica after_id, si no offset), ordenados por ID"""
+        # Ambos caminos ordenan por la PK: el último ID de una página sirve como after_id de la siguiente
+        query = db.query(self.model).options(*self.list_options).order_by(self.model.id)
+        if after_id is not None:
+            # Paginación por clave: usa el índice de la PK en lugar de recorrer y descartar `skip` filas
+            return query.filter(self.model.id > after_id).limit(limit).all()
+        return query.offset(skip).limit(limit).all()
     
     def update(self, db: Session, id: int, **kwargs) -> Optional[ModelType]:
         """Actualizar un registro"""
@@ -52,11 +74,25 @@ class CRUDRepository(Generic[ModelType]):
             
             db.commit()
             db.refresh(db_obj)
-            logger.info(f"Actualizado {self.model.__name__} con ID {db_obj.id}")
+            logger.info("Actualizado %s con ID %s", self.model.__name__, db_obj.id)
             return db_obj
         except SQLAlchemyError as e:
             db.rollback()
-            logger.error(f"Error actualizando {self.model.__name__}: {e}")
+            logger.error("Error actualizando %s: %s", self.model.__name__, e)
+            raise
+    
+    def update_returning(self, db: Session, id: int, **kwargs) -> Optional[ModelType]:
+        """Actualizar con UPDATE ... RETURNING (una sola ida y vuelta, None si no existe)"""
+        try:
+            stmt = update(self.model).where(self.model.id == id).values(**kwargs).returning(self.model)
+            db_obj = db.execute(stmt).scalar_one_or_none()
+            db.commit()
+            if db_obj is not None:
+                logger.info("Actualizado %s con ID %s", self.model.__name__, id)
+            return db_obj
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error("Error actualizando %s: %s", self.model.__name__, e)
             raise
     
     def delete(self, db: Session, id: int) -> bool:
@@ -68,11 +104,11 @@ class CRUDRepository(Generic[ModelType]):
             
             db.delete(db_obj)
             db.commit()
-            logger.info(f"Eliminado {self.model.__name__} con ID {id}")
+            logger.info("Eliminado %s con ID %s", self.model.__name__, id)
             return True
         except SQLAlchemyError as e:
             db.rollback()
-            logger.error(f"Error eliminando {self.model.__name__}: {e}")
+            logger.error("Error eliminando %s: %s", self.model.__name__, e)
             raise
     
     def filter_by(self, db: Session, **filters) -> List[ModelType]:
@@ -94,5 +130,11 @@ class CRUDRepository(Generic[ModelType]):
         return db.query(self.model).count()
     
     def exists(self, db: Session, id: int) -> bool:
-        """Verificar si existe un registro"""
-        return db.query(self.model).filter(self.model.id == id).first() is not None
+        """Verificar si existe un registro (SELECT 1 ... LIMIT 1, sin cargar la entidad)"""
+        return db.scalar(select(literal(1)).where(self.model.id == id).limit(1)) is not None
+    
+    def exists_many(self, db: Session, ids: List[int]) -> Set[int]:
+        """Obtener, en una sola consulta, cuáles de los IDs existen"""
+        if not ids:
+            return set()
+        return set(db.scalars(select(self.model.id).where(self.model.id.in_(set(ids)))))
@@ -66,5 +66,20 @@ class LecturaRepository(CRUDRepository[Lectura]):
         ).scalar()
         return float(result) if result else None
 
+    def get_stats(self, db: Session, sensor_id: int) -> dict:
+        """Obtener promedios y total de lecturas de un sensor en una sola consulta"""
+        from sqlalchemy import func
+        avg_temp, avg_hum, total = db.query(
+            func.avg(Lectura.temperatura),
+            func.avg(Lectura.humedad),
+            func.count(Lectura.id)
+        ).filter(Lectura.sensor_id == sensor_id).one()
+        
+        return {
+            "temperatura_promedio": float(avg_temp) if avg_temp is not None else None,
+            "humedad_promedio": float(avg_hum) if avg_hum is not None else None,
+            "total_lecturas": total
+        }
+
 # Instancia global del repositorio
 lectura_repository = LecturaRepository()
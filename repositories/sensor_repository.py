@@ -1,18 +1,45 @@
 """
 Repositorio específico para Sensores
 """
+import time
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from models.sensor import Sensor
 from models.lectura import Lectura
 from repositories.base import CRUDRepository
 
+# Segundos que se recuerda que un sensor existe (validación previa a cada escritura)
+EXISTS_TTL = 30.0
+EXISTS_CACHE_SIZE = 1024
+
 class SensorRepository(CRUDRepository[Sensor]):
     """Repositorio para operaciones específicas de Sensor"""
     
     def __init__(self):
         super().__init__(Sensor)
+        # sensor_id -> instante de expiración; solo se cachean resultados positivos
+        self._exists_cache: Dict[int, float] = {}
+    
+    def exists(self, db: Session, id: int) -> bool:
+        """Verificar si existe un sensor (positivos cacheados EXISTS_TTL segundos)"""
+        now = time.monotonic()
+        expires = self._exists_cache.get(id)
+        if expires is not None and expires > now:
+            return True
+        
+        found = super().exists(db, id)
+        if found:
+            if len(self._exists_cache) >= EXISTS_CACHE_SIZE:
+                self._exists_cache.clear()
+            self._exists_cache[id] = now + EXISTS_TTL
+        return found
+    
+    def delete(self, db: Session, id: int) -> bool:
+        """Eliminar un sensor y olvidar que existía"""
+        deleted = super().delete(db, id)
+        self._exists_cache.pop(id, None)
+        return deleted
     
     def get_by_tipo(self, db: Session, tipo: str) -> List[Sensor]:
         """Obtener sensores por tipo"""
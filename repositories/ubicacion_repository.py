@@ -1,49 +1,92 @@
 """
 Repositorio específico para Ubicaciones
 """
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import and_, or_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query, Session, raiseload
+from typing import Iterable, List, Optional, Set, Tuple
 
 from models.ubicacion import Ubicacion
 from repositories.base import CRUDRepository
 
+# Tolerancia (en grados, ~1 cm) para considerar iguales dos coordenadas
+COORDINATE_EPSILON = 1e-7
+
+def _same_coordinates(latitud: float, longitud: float):
+    """Condición de coincidencia de coordenadas con tolerancia (usa el índice)"""
+    return and_(
+        Ubicacion.latitud.between(latitud - COORDINATE_EPSILON, latitud + COORDINATE_EPSILON),
+        Ubicacion.longitud.between(longitud - COORDINATE_EPSILON, longitud + COORDINATE_EPSILON)
+    )
+
 class UbicacionRepository(CRUDRepository[Ubicacion]):
     """Repositorio para operaciones específicas de Ubicación"""
     
+    # Columnas que necesita UbicacionResponse: los listados devuelven filas con
+    # solo estos campos en lugar de entidades completas con sus relaciones
+    response_columns = (
+        Ubicacion.id,
+        Ubicacion.sensor_id,
+        Ubicacion.latitud,
+        Ubicacion.longitud,
+        Ubicacion.descripcion,
+        Ubicacion.created_at,
+        Ubicacion.updated_at
+    )
+    
+    # UbicacionResponse no usa relaciones: cualquier carga perezosa en un listado es un error
+    list_options = (raiseload("*"),)
+    
     def __init__(self):
         super().__init__(Ubicacion)
     
-    def get_by_sensor(self, db: Session, sensor_id: int) -> List[Ubicacion]:
+    def _query_rows(self, db: Session) -> Query:
+        """Consulta de las columnas de respuesta"""
+        return db.query(*self.response_columns)
+    
+    def get_by_sensor(self, db: Session, sensor_id: int) -> List[Row]:
         """Obtener ubicaciones por sensor"""
-        return db.query(Ubicacion).filter(Ubicacion.sensor_id == sensor_id).all()
+        return self._query_rows(db).filter(Ubicacion.sensor_id == sensor_id).all()
+    
+    def get_by_coordinates(self, db: Session, latitud: float, longitud: float) -> Optional[Ubicacion]:
+        """Obtener ubicación por coordenadas (con tolerancia COORDINATE_EPSILON)"""
+        return db.query(Ubicacion).filter(_same_coordinates(latitud, longitud)).first()
     
-    def get_by_coordinates(self, db: Session, latitud: str, longitud: str) -> Optional[Ubicacion]:
-        """Obtener ubicación por coordenadas exactas"""
-        return db.query(Ubicacion).filter(
-            Ubicacion.latitud == latitud,
-            Ubicacion.longitud == longitud
-        ).first()
+    def get_existing_coordinates(
+        self, 
+        db: Session, 
+        coordinates: Iterable[Tuple[float, float]]
+    ) -> Set[Tuple[float, float]]:
+        """Obtener, en una sola consulta, cuáles de las coordenadas ya están registradas"""
+        conditions = [_same_coordinates(latitud, longitud) for latitud, longitud in coordinates]
+        if not conditions:
+            return set()
+        rows = db.query(Ubicacion.latitud, Ubicacion.longitud).filter(or_(*conditions)).all()
+        return {(latitud, longitud) for latitud, longitud in rows}
     
     def get_nearby_locations(
         self, 
         db: Session, 
-        latitud_base: str, 
-        longitud_base: str, 
+        latitud_base: float, 
+        longitud_base: float, 
         radio: float = 0.01
-    ) -> List[Ubicacion]:
-        """Obtener ubicaciones cercanas (aproximación simple)"""
-        # Esta es una aproximación básica, en producción usarías funciones geoespaciales
-        lat_float = float(latitud_base)
-        lng_float = float(longitud_base)
+    ) -> List[Row]:
+        """Obtener ubicaciones cercanas (filtrado completo en SQL)"""
+        # La base de datos solo devuelve las filas dentro del radio: primero el
+        # recuadro delimitador (usa el índice de coordenadas), después la
+        # distancia (en grados) al punto base
+        d_lat = Ubicacion.latitud - latitud_base
+        d_lng = Ubicacion.longitud - longitud_base
         
-        return db.query(Ubicacion).filter(
-            Ubicacion.latitud.between(str(lat_float - radio), str(lat_float + radio)),
-            Ubicacion.longitud.between(str(lng_float - radio), str(lng_float + radio))
+        return self._query_rows(db).filter(
+            Ubicacion.latitud.between(latitud_base - radio, latitud_base + radio),
+            Ubicacion.longitud.between(longitud_base - radio, longitud_base + radio),
+            d_lat * d_lat + d_lng * d_lng <= radio * radio
         ).all()
     
-    def search_by_description(self, db: Session, search_term: str) -> List[Ubicacion]:
+    def search_by_description(self, db: Session, search_term: str) -> List[Row]:
         """Buscar ubicaciones por descripción"""
-        return db.query(Ubicacion).filter(
+        return self._query_rows(db).filter(
             Ubicacion.descripcion.ilike(f"%{search_term}%")
         ).all()
 
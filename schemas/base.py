@@ -24,14 +24,20 @@ class BaseSchema(BaseModel):
 
     def dict(self, **kwargs):
         """Método dict compatible que excluye campos de configuración"""
-        if hasattr(super(), 'model_dump'):
-            data = super().model_dump(**kwargs)
-        else:
-            data = super().dict(**kwargs)
+        # La versión de Pydantic se resuelve al importar (PYDANTIC_V2), no en cada llamada
+        data = self.model_dump(**kwargs) if PYDANTIC_V2 else super().dict(**kwargs)
         
         # Filtrar campos que no deben ir a la base de datos
-        excluded_fields = ['model_config']
-        return {k: v for k, v in data.items() if k not in excluded_fields}
+        data.pop('model_config', None)
+        return data
+
+def reject_null(value):
+    """Validador para campos de actualización opcionales pero no anulables.
+    Los updates usan model_dump(exclude_unset=True): omitir el campo lo deja
+    igual, y un null explícito se rechaza aquí en lugar de fallar en la base de datos"""
+    if value is None:
+        raise ValueError("no puede ser null")
+    return value
 
 class TimestampSchema(BaseSchema):
     """Esquema base con timestamps"""
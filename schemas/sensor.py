@@ -2,7 +2,9 @@
 Esquemas Pydantic para Sensor
 """
 from typing import List, Optional
-from schemas.base import BaseSchema, BaseResponse
+from pydantic import field_validator
+
+from schemas.base import BaseSchema, BaseResponse, reject_null
 
 class SensorBase(BaseSchema):
     """Campos base del sensor"""
@@ -17,6 +19,8 @@ class SensorUpdate(BaseSchema):
     """Esquema para actualizar sensor (campos opcionales)"""
     tipo: Optional[str] = None
     modelo: Optional[str] = None
+    
+    _not_null = field_validator("tipo", "modelo")(reject_null)
 
 class SensorResponse(SensorBase, BaseResponse):
     """Esquema de respuesta completo"""
@@ -2,13 +2,15 @@
 Esquemas Pydantic para Ubicación
 """
 from typing import Optional, List
-from schemas.base import BaseSchema, BaseResponse
+from pydantic import field_validator
+
+from schemas.base import BaseSchema, BaseResponse, reject_null
 
 class UbicacionBase(BaseSchema):
     """Campos base de la ubicación"""
     sensor_id: int
-    latitud: str
-    longitud: str
+    latitud: float
+    longitud: float
     descripcion: Optional[str] = None
 
 class UbicacionCreate(UbicacionBase):
@@ -16,11 +18,13 @@ class UbicacionCreate(UbicacionBase):
     pass
 
 class UbicacionUpdate(BaseSchema):
-    """Esquema para actualizar ubicación"""
+    """Esquema para actualizar ubicación (descripcion admite null para borrarla)"""
     sensor_id: Optional[int] = None
-    latitud: Optional[str] = None
-    longitud: Optional[str] = None
+    latitud: Optional[float] = None
+    longitud: Optional[float] = None
     descripcion: Optional[str] = None
+    
+    _not_null = field_validator("sensor_id", "latitud", "longitud")(reject_null)
 
 class UbicacionResponse(UbicacionBase, BaseResponse):
     """Esquema de respuesta completo"""
@@ -1,7 +1,8 @@
 """
 Servicio para manejar lógica de negocio de anomalías
 """
-from typing import List, Optional
+import time
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from models.anomalia import Anomalia
@@ -9,12 +10,23 @@ from repositories.anomalia_repository import anomalia_repository
 from repositories.lectura_repository import lectura_repository
 from schemas.anomalia import AnomaliaCreate, AnomaliaUpdate
 
+# Tipos de anomalía aceptados (constantes de módulo: comprobación O(1) sin reconstruir listas)
+TEMPERATURE_ANOMALY_TYPES = frozenset({"temperatura_alta", "temperatura_baja"})
+HUMIDITY_ANOMALY_TYPES = frozenset({"humedad_alta", "humedad_baja"})
+VALID_ANOMALY_TYPES = TEMPERATURE_ANOMALY_TYPES | HUMIDITY_ANOMALY_TYPES | frozenset({
+    "sensor_desconectado", "lectura_invalida"
+})
+
+# Segundos que se reutilizan las estadísticas (dashboards que consultan a menudo)
+STATISTICS_TTL = 1.0
+
 class AnomaliaService:
     """Servicio para manejar lógica de negocio de anomalías"""
     
     def __init__(self):
         self.repository = anomalia_repository
         self.lectura_repository = lectura_repository
+        self._statistics_cache: Optional[Tuple[float, dict]] = None
     
     def create_anomalia(self, db: Session, anomalia_data: AnomaliaCreate) -> Anomalia:
         """Crear una nueva anomalía"""
@@ -29,7 +41,9 @@ class AnomaliaService:
         self._validate_anomaly_value(anomalia_data.tipo, anomalia_data.valor)
         
         # Crear la anomalía
-        return self.repository.create(db, **anomalia_data.dict())
+        anomalia = self.repository.create(db, **anomalia_data.model_dump())
+        self._statistics_cache = None
+        return anomalia
         
     def get_anomalia(self, db: Session, anomalia_id: int) -> Optional[Anomalia]:
         """Obtener una anomalía por ID"""
@@ -70,20 +84,31 @@ class AnomaliaService:
             if not self.lectura_repository.get_by_id(db, anomalia_data.lectura_id):
                 raise ValueError(f"Lectura con ID {anomalia_data.lectura_id} no existe")
         
-        return self.repository.update(db, anomalia_id, **anomalia_data.dict(exclude_unset=True))
+        anomalia = self.repository.update(db, anomalia_id, **anomalia_data.model_dump(exclude_unset=True))
+        self._statistics_cache = None
+        return anomalia
         
     def delete_anomalia(self, db: Session, anomalia_id: int) -> bool:
         """Eliminar una anomalía"""
-        return self.repository.delete(db, anomalia_id)
+        deleted = self.repository.delete(db, anomalia_id)
+        self._statistics_cache = None
+        return deleted
     
     def get_anomaly_statistics(self, db: Session) -> dict:
-        """Obtener estadísticas de anomalías"""
-        return {
-            "total": self.repository.count(db),
+        """Obtener estadísticas de anomalías (conteos en SQL, cacheados STATISTICS_TTL segundos)"""
+        now = time.monotonic()
+        if self._statistics_cache is not None and self._statistics_cache[0] > now:
+            return self._statistics_cache[1]
+        
+        counts = self.repository.get_statistics(db, hours=24)
+        statistics = {
+            "total": counts["total"],
             "por_tipo": self.repository.count_by_type(db),
-            "recientes_24h": len(self.get_recent_anomalias(db, 24)),
-            "criticas": len(self.get_critical_anomalias(db))
+            "recientes_24h": counts["recientes"],
+            "criticas": counts["criticas"]
         }
+        self._statistics_cache = (now + STATISTICS_TTL, statistics)
+        return statistics
     
     def detect_anomalies_in_reading(self, db: Session, lectura_id: int) -> List[Anomalia]:
         """Detectar anomalías automáticamente en una lectura"""
@@ -133,22 +158,16 @@ class AnomaliaService:
     
     def _validate_anomaly_type(self, tipo: str):
         """Validar que el tipo de anomalía sea válido"""
-        valid_types = [
-            "temperatura_alta", "temperatura_baja",
-            "humedad_alta", "humedad_baja",
-            "sensor_desconectado", "lectura_invalida"
-        ]
-        
-        if tipo not in valid_types:
-            raise ValueError(f"Tipo de anomalía '{tipo}' no válido. Tipos válidos: {valid_types}")
+        if tipo not in VALID_ANOMALY_TYPES:
+            raise ValueError(f"Tipo de anomalía '{tipo}' no válido. Tipos válidos: {sorted(VALID_ANOMALY_TYPES)}")
     
     def _validate_anomaly_value(self, tipo: str, valor: float):
         """Validar que el valor de la anomalía sea coherente con su tipo"""
-        if tipo in ["temperatura_alta", "temperatura_baja"]:
+        if tipo in TEMPERATURE_ANOMALY_TYPES:
             if not (-50 <= valor <= 70):
                 raise ValueError(f"Valor de temperatura {valor} fuera del rango válido (-50°C a 70°C)")
         
-        elif tipo in ["humedad_alta", "humedad_baja"]:
+        elif tipo in HUMIDITY_ANOMALY_TYPES:
             if not (0 <= valor <= 100):
                 raise ValueError(f"Valor de humedad {valor} fuera del rango válido (0% a 100%)")
 
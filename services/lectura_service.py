@@ -23,10 +23,23 @@ class LecturaService:
             raise ValueError(f"Sensor con ID {lectura_data.sensor_id} no existe")
         
         # Aquí puedes agregar más validaciones de negocio
-        self._validate_reading_values(lectura_data)
+        self._validate_reading_values(lectura_data.temperatura, lectura_data.humedad)
         
         return self.repository.create(db, **lectura_data.model_dump())
     
+    def create_many_lecturas(self, db: Session, lecturas_data: List[LecturaCreate]) -> List[Lectura]:
+        """Crear varias lecturas con una validación de sensores y un único INSERT"""
+        for lectura_data in lecturas_data:
+            self._validate_reading_values(lectura_data.temperatura, lectura_data.humedad)
+        
+        # Validar que los sensores existen
+        sensor_ids = {lectura_data.sensor_id for lectura_data in lecturas_data}
+        missing = sensor_ids - self.sensor_repository.exists_many(db, list(sensor_ids))
+        if missing:
+            raise ValueError(f"Sensores con ID {sorted(missing)} no existen")
+        
+        return self.repository.create_many(db, [l.model_dump() for l in lecturas_data])
+    
     def get_lectura(self, db: Session, lectura_id: int) -> Optional[Lectura]:
         """Obtener una lectura por ID"""
         return self.repository.get_by_id(db, lectura_id)
@@ -42,18 +55,12 @@ class LecturaService:
     def update_lectura(self, db: Session, lectura_id: int, lectura_data: LecturaUpdate) -> Optional[Lectura]:
         """Actualizar una lectura"""
         # Filtrar campos None
-        update_data = {k: v for k, v in lectura_data.model_dump().items() if v is not None}
+        update_data = lectura_data.model_dump(exclude_none=True)
         if not update_data:
             return self.get_lectura(db, lectura_id)
         
         # Validar valores si se están actualizando
-        if 'temperatura' in update_data or 'humedad' in update_data:
-            temp_lectura = LecturaCreate(
-                sensor_id=1,  # Temporal, solo para validación
-                temperatura=update_data.get('temperatura', 0),
-                humedad=update_data.get('humedad', 0)
-            )
-            self._validate_reading_values(temp_lectura)
+        self._validate_reading_values(update_data.get('temperatura'), update_data.get('humedad'))
         
         return self.repository.update(db, lectura_id, **update_data)
     
@@ -63,21 +70,14 @@ class LecturaService:
     
     def get_sensor_stats(self, db: Session, sensor_id: int) -> dict:
         """Obtener estadísticas de un sensor"""
-        avg_temp = self.repository.get_average_temperature(db, sensor_id)
-        avg_hum = self.repository.get_average_humidity(db, sensor_id)
-        
-        return {
-            "temperatura_promedio": avg_temp,
-            "humedad_promedio": avg_hum,
-            "total_lecturas": len(self.get_readings_by_sensor(db, sensor_id))
-        }
+        return self.repository.get_stats(db, sensor_id)
     
-    def _validate_reading_values(self, lectura: LecturaCreate):
-        """Validar que los valores de la lectura son razonables"""
-        if lectura.temperatura < -50 or lectura.temperatura > 60:
+    def _validate_reading_values(self, temperatura: Optional[float], humedad: Optional[float]):
+        """Validar que los valores de la lectura son razonables (None = no se valida)"""
+        if temperatura is not None and not (-50 <= temperatura <= 60):
             raise ValueError("Temperatura fuera del rango válido (-50°C a 60°C)")
         
-        if lectura.humedad < 0 or lectura.humedad > 100:
+        if humedad is not None and not (0 <= humedad <= 100):
             raise ValueError("Humedad fuera del rango válido (0% a 100%)")
 
 # Instancia global del servicio
@@ -22,7 +22,7 @@ class PrediccionService:
 
     def create(self, prediccion_data: PrediccionCreate) -> PrediccionSequia:
         """Crear nueva predicción"""
-        return self.repository.create(self.db, **prediccion_data.dict())
+        return self.repository.create(self.db, **prediccion_data.model_dump())
 
     def get_by_id(self, prediccion_id: int) -> Optional[PrediccionSequia]:
         """Obtener predicción por ID"""
@@ -34,7 +34,7 @@ class PrediccionService:
 
     def update(self, prediccion_id: int, prediccion_data: PrediccionUpdate) -> Optional[PrediccionSequia]:
         """Actualizar predicción"""
-        return self.repository.update(self.db, prediccion_id, **prediccion_data.dict(exclude_unset=True))
+        return self.repository.update(self.db, prediccion_id, **prediccion_data.model_dump(exclude_unset=True))
 
     def delete(self, prediccion_id: int) -> bool:
         """Eliminar predicción"""
@@ -81,8 +81,8 @@ class PrediccionService:
                 comentario=comentario
             )
             
-            logger.info(f"Predicción generada para ubicación {ubicacion_id}: {probabilidad:.1%} de riesgo")
-            return self.repository.create(self.db, **prediccion_data.dict())
+            logger.info("Predicción generada para ubicación %s: %.1f%% de riesgo", ubicacion_id, probabilidad * 100)
+            return self.repository.create(self.db, **prediccion_data.model_dump())
             
         except Exception as e:
             logger.error(f"Error generando predicción: {e}")
@@ -104,7 +104,7 @@ class PrediccionService:
             comentario=comentario + " (método fallback)"
         )
         
-        return self.repository.create(self.db, **prediccion_data.dict())
+        return self.repository.create(self.db, **prediccion_data.model_dump())
 
     def get_statistics(self) -> dict:
         """Obtener estadísticas de predicciones"""
@@ -230,7 +230,7 @@ class PrediccionService:
     def update_prediccion(self, db: Session, prediccion_id: int, prediccion_data: PrediccionUpdate) -> Optional[PrediccionSequia]:
         """Actualizar una predicción"""
         # Filtrar campos None
-        update_data = {k: v for k, v in prediccion_data.model_dump().items() if v is not None}
+        update_data = prediccion_data.model_dump(exclude_none=True)
         if not update_data:
             return self.get_prediccion(db, prediccion_id)
         
@@ -1,8 +1,12 @@
 """
 Servicios (casos de uso) para Sensores
+
+Los métodos son asíncronos: reutilizan los repositorios síncronos a través de
+AsyncSession.run_sync, de modo que la espera de la base de datos no bloquea
+el event loop.
 """
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.sensor import Sensor
 from repositories.sensor_repository import sensor_repository
@@ -14,39 +18,39 @@ class SensorService:
     def __init__(self):
         self.repository = sensor_repository
     
-    def create_sensor(self, db: Session, sensor_data: SensorCreate) -> Sensor:
+    async def create_sensor(self, db: AsyncSession, sensor_data: SensorCreate) -> Sensor:
         """Crear un nuevo sensor"""
         # Aquí puedes agregar validaciones de negocio
-        return self.repository.create(db, **sensor_data.dict())
+        return await db.run_sync(self.repository.create, **sensor_data.model_dump())
     
-    def get_sensor(self, db: Session, sensor_id: int) -> Optional[Sensor]:
+    async def get_sensor(self, db: AsyncSession, sensor_id: int) -> Optional[Sensor]:
         """Obtener un sensor por ID"""
-        return self.repository.get_by_id(db, sensor_id)
+        return await db.run_sync(self.repository.get_by_id, sensor_id)
     
-    def get_all_sensors(self, db: Session, skip: int = 0, limit: int = 100) -> List[Sensor]:
+    async def get_all_sensors(self, db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Sensor]:
         """Obtener todos los sensores con paginación"""
-        return self.repository.get_all(db, skip=skip, limit=limit)
+        return await db.run_sync(self.repository.get_all, skip=skip, limit=limit)
     
-    def update_sensor(self, db: Session, sensor_id: int, sensor_data: SensorUpdate) -> Optional[Sensor]:
+    async def update_sensor(self, db: AsyncSession, sensor_id: int, sensor_data: SensorUpdate) -> Optional[Sensor]:
         """Actualizar un sensor"""
-        # Filtrar campos None
-        update_data = {k: v for k, v in sensor_data.model_dump().items() if v is not None}
+        # Solo los campos enviados por el cliente
+        update_data = sensor_data.model_dump(exclude_unset=True)
         if not update_data:
-            return self.get_sensor(db, sensor_id)
+            return await self.get_sensor(db, sensor_id)
         
-        return self.repository.update(db, sensor_id, **update_data)
+        return await db.run_sync(self.repository.update_returning, sensor_id, **update_data)
     
-    def delete_sensor(self, db: Session, sensor_id: int) -> bool:
+    async def delete_sensor(self, db: AsyncSession, sensor_id: int) -> bool:
         """Eliminar un sensor"""
-        return self.repository.delete(db, sensor_id)
+        return await db.run_sync(self.repository.delete, sensor_id)
     
-    def get_sensors_by_type(self, db: Session, tipo: str) -> List[Sensor]:
+    async def get_sensors_by_type(self, db: AsyncSession, tipo: str) -> List[Sensor]:
         """Obtener sensores por tipo"""
-        return self.repository.get_by_tipo(db, tipo)
+        return await db.run_sync(self.repository.get_by_tipo, tipo)
     
-    def sensor_exists(self, db: Session, sensor_id: int) -> bool:
+    async def sensor_exists(self, db: AsyncSession, sensor_id: int) -> bool:
         """Verificar si existe un sensor"""
-        return self.repository.exists(db, sensor_id)
+        return await db.run_sync(self.repository.exists, sensor_id)
 
 # Instancia global del servicio
 sensor_service = SensorService()
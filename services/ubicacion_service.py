@@ -1,8 +1,14 @@
 """
 Servicio para manejar lógica de negocio de ubicaciones
+
+Los métodos son asíncronos: reutilizan los repositorios síncronos a través de
+AsyncSession.run_sync, de modo que la espera de la base de datos no bloquea
+el event loop.
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, List, Optional
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.ubicacion import Ubicacion
 from repositories.ubicacion_repository import ubicacion_repository
@@ -16,82 +22,123 @@ class UbicacionService:
         self.repository = ubicacion_repository
         self.sensor_repository = sensor_repository
     
-    def create_ubicacion(self, db: Session, ubicacion_data: UbicacionCreate) -> Ubicacion:
+    async def create_ubicacion(self, db: AsyncSession, ubicacion_data: UbicacionCreate) -> Ubicacion:
         """Crear una nueva ubicación"""
         # Validar que el sensor existe
-        if not self.sensor_repository.exists(db, ubicacion_data.sensor_id):
+        if not await db.run_sync(self.sensor_repository.exists, ubicacion_data.sensor_id):
             raise ValueError(f"Sensor con ID {ubicacion_data.sensor_id} no existe")
         
         # Validar coordenadas
         self._validate_coordinates(ubicacion_data.latitud, ubicacion_data.longitud)
         
         # Verificar que no exista una ubicación exacta ya
-        existing = self.repository.get_by_coordinates(db, ubicacion_data.latitud, ubicacion_data.longitud)
+        existing = await db.run_sync(
+            self.repository.get_by_coordinates, ubicacion_data.latitud, ubicacion_data.longitud
+        )
         if existing:
             raise ValueError(f"Ya existe una ubicación en las coordenadas {ubicacion_data.latitud}, {ubicacion_data.longitud}")
         
         # Crear la ubicación
-        return self.repository.create(db, **ubicacion_data.dict())
+        return await db.run_sync(self.repository.create, **ubicacion_data.model_dump())
+        
+    async def create_many_ubicaciones(self, db: AsyncSession, ubicaciones_data: List[UbicacionCreate]) -> List[Ubicacion]:
+        """Crear varias ubicaciones validando sensores y coordenadas con una consulta cada uno"""
+        for ubicacion_data in ubicaciones_data:
+            self._validate_coordinates(ubicacion_data.latitud, ubicacion_data.longitud)
+        
+        # Validar que los sensores existen
+        sensor_ids = {ubicacion_data.sensor_id for ubicacion_data in ubicaciones_data}
+        missing = sensor_ids - await db.run_sync(self.sensor_repository.exists_many, list(sensor_ids))
+        if missing:
+            raise ValueError(f"Sensores con ID {sorted(missing)} no existen")
         
-    def get_ubicacion(self, db: Session, ubicacion_id: int) -> Optional[Ubicacion]:
+        # Verificar coordenadas repetidas en el lote o ya registradas
+        coordinates = [(u.latitud, u.longitud) for u in ubicaciones_data]
+        if len(set(coordinates)) != len(coordinates):
+            raise ValueError("El lote contiene coordenadas repetidas")
+        existing = await db.run_sync(self.repository.get_existing_coordinates, coordinates)
+        if existing:
+            latitud, longitud = next(iter(existing))
+            raise ValueError(f"Ya existe una ubicación en las coordenadas {latitud}, {longitud}")
+        
+        return await db.run_sync(
+            self.repository.create_many, [u.model_dump() for u in ubicaciones_data]
+        )
+    
+    async def get_ubicacion(self, db: AsyncSession, ubicacion_id: int) -> Optional[Ubicacion]:
         """Obtener una ubicación por ID"""
-        return self.repository.get_by_id(db, ubicacion_id)
+        return await db.run_sync(self.repository.get_by_id, ubicacion_id)
     
-    def get_all_ubicaciones(self, db: Session, skip: int = 0, limit: int = 100) -> List[Ubicacion]:
+    async def get_all_ubicaciones(
+        self, 
+        db: AsyncSession, 
+        skip: int = 0, 
+        limit: int = 100, 
+        after_id: Optional[int] = None
+    ) -> List[Ubicacion]:
         """Obtener todas las ubicaciones con paginación"""
-        return self.repository.get_all(db, skip=skip, limit=limit)
+        return await db.run_sync(self.repository.get_all, skip=skip, limit=limit, after_id=after_id)
+    
+    async def stream_ubicaciones(self, db: AsyncSession, batch_size: int = 500) -> AsyncIterator[Ubicacion]:
+        """Recorrer todas las ubicaciones por lotes, sin cargar la tabla completa en memoria"""
+        query = select(Ubicacion).order_by(Ubicacion.id).execution_options(yield_per=batch_size)
+        result = await db.stream_scalars(query)
+        async for ubicacion in result:
+            yield ubicacion
     
-    def get_ubicaciones_by_sensor(self, db: Session, sensor_id: int) -> List[Ubicacion]:
+    async def get_ubicaciones_by_sensor(self, db: AsyncSession, sensor_id: int) -> List[Row]:
         """Obtener ubicaciones de un sensor específico"""
-        return self.repository.get_by_sensor(db, sensor_id)
+        return await db.run_sync(self.repository.get_by_sensor, sensor_id)
     
-    def update_ubicacion(self, db: Session, ubicacion_id: int, ubicacion_data: UbicacionUpdate) -> Optional[Ubicacion]:
+    async def update_ubicacion(self, db: AsyncSession, ubicacion_id: int, ubicacion_data: UbicacionUpdate) -> Optional[Ubicacion]:
         """Actualizar ubicación"""
-        # Validar coordenadas si se proporcionan
-        if ubicacion_data.latitud is not None and ubicacion_data.longitud is not None:
-            self._validate_coordinates(ubicacion_data.latitud, ubicacion_data.longitud)
+        # Validar coordenadas si se proporcionan (si llega solo una, se completa con la guardada)
+        latitud, longitud = ubicacion_data.latitud, ubicacion_data.longitud
+        if latitud is not None or longitud is not None:
+            if latitud is None or longitud is None:
+                current = await self.get_ubicacion(db, ubicacion_id)
+                if current is None:
+                    return None
+                latitud = current.latitud if latitud is None else latitud
+                longitud = current.longitud if longitud is None else longitud
+            self._validate_coordinates(latitud, longitud)
         
         # Validar que el sensor existe si se proporciona
         if ubicacion_data.sensor_id is not None:
-            if not self.sensor_repository.exists(db, ubicacion_data.sensor_id):
+            if not await db.run_sync(self.sensor_repository.exists, ubicacion_data.sensor_id):
                 raise ValueError(f"Sensor con ID {ubicacion_data.sensor_id} no existe")
         
-        return self.repository.update(db, ubicacion_id, **ubicacion_data.dict(exclude_unset=True))
+        update_data = ubicacion_data.model_dump(exclude_unset=True)
+        if not update_data:
+            return await self.get_ubicacion(db, ubicacion_id)
+        
+        return await db.run_sync(self.repository.update_returning, ubicacion_id, **update_data)
         
-    def delete_ubicacion(self, db: Session, ubicacion_id: int) -> bool:
+    async def delete_ubicacion(self, db: AsyncSession, ubicacion_id: int) -> bool:
         """Eliminar una ubicación"""
-        return self.repository.delete(db, ubicacion_id)
+        return await db.run_sync(self.repository.delete, ubicacion_id)
     
-    def search_ubicaciones(self, db: Session, search_term: str) -> List[Ubicacion]:
+    async def search_ubicaciones(self, db: AsyncSession, search_term: str) -> List[Row]:
         """Buscar ubicaciones por descripción"""
-        return self.repository.search_by_description(db, search_term)
+        return await db.run_sync(self.repository.search_by_description, search_term)
     
-    def get_nearby_locations(
+    async def get_nearby_locations(
         self, 
-        db: Session, 
-        latitud: str, 
-        longitud: str, 
+        db: AsyncSession, 
+        latitud: float, 
+        longitud: float, 
         radio: float = 0.01
-    ) -> List[Ubicacion]:
+    ) -> List[Row]:
         """Obtener ubicaciones cercanas"""
-        return self.repository.get_nearby_locations(db, latitud, longitud, radio)
+        return await db.run_sync(self.repository.get_nearby_locations, latitud, longitud, radio)
     
-    def _validate_coordinates(self, latitud: str, longitud: str):
-        """Validar que las coordenadas sean válidas"""
-        try:
-            lat_float = float(latitud)
-            lng_float = float(longitud)
-            
-            if not (-90 <= lat_float <= 90):
-                raise ValueError("Latitud debe estar entre -90 y 90 grados")
-            
-            if not (-180 <= lng_float <= 180):
-                raise ValueError("Longitud debe estar entre -180 y 180 grados")
-                
-        except ValueError as e:
-            if "invalid literal" in str(e):
-                raise ValueError("Coordenadas deben ser números válidos")
-            raise
+    def _validate_coordinates(self, latitud: float, longitud: float):
+        """Validar que las coordenadas estén en rango"""
+        if not (-90.0 <= latitud <= 90.0 and -180.0 <= longitud <= 180.0):
+            raise ValueError(
+                f"Coordenadas ({latitud}, {longitud}) fuera del rango válido: "
+                "latitud entre -90 y 90, longitud entre -180 y 180"
+            )
 
 # Instancia global del servicio
 ubicacion_service = UbicacionService()
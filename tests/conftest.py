@@ -3,13 +3,28 @@ Configuración de pruebas
 """
 import pytest
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 from fastapi.testclient import TestClient
 import os
+import tempfile
+
+# Base de datos de testing: SQLite en archivo temporal, compartido por el
+# engine síncrono y el asíncrono para que ambos vean los mismos datos
+TEST_DB_PATH = os.path.join(tempfile.mkdtemp(), "test_sensores.db")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{TEST_DB_PATH}"
+
+# Configurar entorno de testing (antes de importar la aplicación). Las sesiones
+# de los endpoints se sustituyen con dependency_overrides; DATABASE_URL solo
+# evita que el lifespan (create_tables) toque la base de datos por defecto
+os.environ["ENV"] = "testing"
+os.environ["DATABASE_URL"] = SQLALCHEMY_DATABASE_URL
 
 from core.app import create_app
-from core.database import Base
+from core.database import Base, get_async_database_url
 from core.settings import get_settings
+from repositories.sensor_repository import sensor_repository
 
 # Importar todos los modelos para que se registren en Base
 from models.sensor import Sensor
@@ -18,23 +33,31 @@ from models.ubicacion import Ubicacion
 from models.anomalia import Anomalia
 from models.prediccion import PrediccionSequia
 
-# Configurar entorno de testing
-os.environ["ENV"] = "testing"
 settings = get_settings()
 
-# Engine de testing (SQLite en memoria)
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
-test_engine = create_engine(SQLALCHEMY_DATABASE_URL, echo=False)
+# Engines de testing
+test_engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    echo=False,
+    connect_args={"check_same_thread": False}
+)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
 
+test_async_engine = create_async_engine(
+    get_async_database_url(SQLALCHEMY_DATABASE_URL),
+    echo=False,
+    poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(bind=test_async_engine, autoflush=False, expire_on_commit=False)
+
 @pytest.fixture(scope="session")
 def app():
     """Fixture de la aplicación FastAPI"""
-    from core.database import get_db
-    
-    # Crear tablas en SQLite en memoria
+    from core.database import get_db, get_async_db, get_async_sessionmaker
+
+    # Crear tablas en la base de datos de testing
     Base.metadata.create_all(bind=test_engine)
-    
+
     def override_get_db():
         """Override para la BD de testing"""
         try:
@@ -42,25 +65,41 @@ def app():
             yield db
         finally:
             db.close()
-    
+
+    async def override_get_async_db():
+        """Override asíncrono para la BD de testing"""
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
     app = create_app()
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_sessionmaker] = lambda: TestingAsyncSessionLocal
     return app
 
 @pytest.fixture(scope="session")
 def client(app):
-    """Cliente de testing"""
-    return TestClient(app)
+    """Cliente de testing (ejecuta el lifespan: cache y cola de tareas)"""
+    with TestClient(app) as client:
+        yield client
 
 @pytest.fixture
-def db():
-    """Fixture de base de datos para testing"""
-    # Las tablas ya están creadas en el fixture de sesión
-    db = TestingSessionLocal()
+def db(app):
+    """
+    Sesión de base de datos dentro de una transacción que se revierte al final,
+    de modo que el test no deja filas (los commit del repositorio no la cierran)
+    """
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    db = Session(bind=connection)
     try:
         yield db
     finally:
         db.close()
+        transaction.rollback()
+        connection.close()
+        # Los sensores revertidos no deben seguir "existiendo" en el cache del repositorio
+        sensor_repository._exists_cache.clear()
 
 @pytest.fixture
 def auth_headers(client):
@@ -0,0 +1,31 @@
+"""
+Pruebas para el cache de respuestas
+"""
+import asyncio
+
+from core.cache import InMemoryBackend
+
+def test_in_memory_backend_is_bounded():
+    """Test el backend en memoria no crece por encima de max_entries"""
+    async def run():
+        backend = InMemoryBackend(max_entries=10)
+        for i in range(100):
+            await backend.set(f"ubicaciones:search:q={i}", b"[]", expire=30)
+        assert len(backend._store) <= 10
+        # Las entradas más recientes se conservan
+        assert await backend.get("ubicaciones:search:q=99") == b"[]"
+        assert await backend.get("ubicaciones:search:q=0") is None
+
+    asyncio.run(run())
+
+def test_in_memory_backend_purges_expired_entries():
+    """Test al llenarse se descartan primero las entradas expiradas"""
+    async def run():
+        backend = InMemoryBackend(max_entries=3)
+        await backend.set("viva", b"1", expire=30)
+        await backend.set("expirada-1", b"2", expire=-1)
+        await backend.set("expirada-2", b"3", expire=-1)
+        await backend.set("nueva", b"4", expire=30)
+        assert set(backend._store) == {"viva", "nueva"}
+
+    asyncio.run(run())
@@ -0,0 +1,34 @@
+"""
+Pruebas para los manejadores de excepciones centralizados
+"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from core.exceptions import register_exception_handlers
+
+def _make_client() -> TestClient:
+    app = FastAPI()
+    register_exception_handlers(app)
+
+    @app.get("/valor")
+    def valor_invalido():
+        raise ValueError("Valor fuera de rango")
+
+    @app.get("/interno")
+    def validacion_interna():
+        return TypeAdapter(int).validate_python("no-es-un-numero")
+
+    return TestClient(app, raise_server_exceptions=False)
+
+def test_value_error_returns_400():
+    """Test los errores de negocio se traducen a 400 con su mensaje"""
+    response = _make_client().get("/valor")
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Valor fuera de rango"}
+
+def test_pydantic_validation_error_returns_500():
+    """Test un ValidationError interno no se expone como 400"""
+    response = _make_client().get("/interno")
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Error interno del servidor"}
@@ -0,0 +1,59 @@
+"""
+Pruebas para lecturas
+"""
+
+def test_sensor_stats(client, auth_headers):
+    """Test estadísticas de lecturas de un sensor"""
+    sensor_data = {"tipo": "ambiental", "modelo": "STATS-LEC"}
+    sensor_response = client.post("/api/v1/sensores/", json=sensor_data, headers=auth_headers)
+    sensor_id = sensor_response.json()["id"]
+    
+    for temperatura, humedad in [(20.0, 40.0), (30.0, 60.0)]:
+        client.post("/api/v1/lecturas/", json={
+            "sensor_id": sensor_id,
+            "temperatura": temperatura,
+            "humedad": humedad
+        }, headers=auth_headers)
+    
+    response = client.get(f"/api/v1/lecturas/sensor/{sensor_id}/stats", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["temperatura_promedio"] == 25.0
+    assert data["humedad_promedio"] == 50.0
+    assert data["total_lecturas"] == 2
+
+def test_sensor_stats_without_readings(client, auth_headers):
+    """Test estadísticas de un sensor sin lecturas"""
+    sensor_data = {"tipo": "ambiental", "modelo": "STATS-VACIO"}
+    sensor_response = client.post("/api/v1/sensores/", json=sensor_data, headers=auth_headers)
+    sensor_id = sensor_response.json()["id"]
+    
+    response = client.get(f"/api/v1/lecturas/sensor/{sensor_id}/stats", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "temperatura_promedio": None,
+        "humedad_promedio": None,
+        "total_lecturas": 0
+    }
+
+def test_create_readings_bulk(client, auth_headers):
+    """Test crear varias lecturas en una petición"""
+    sensor_data = {"tipo": "ambiental", "modelo": "BULK-LEC"}
+    sensor_response = client.post("/api/v1/sensores/", json=sensor_data, headers=auth_headers)
+    sensor_id = sensor_response.json()["id"]
+    
+    lecturas = [
+        {"sensor_id": sensor_id, "temperatura": 20.0 + i, "humedad": 50.0}
+        for i in range(3)
+    ]
+    response = client.post("/api/v1/lecturas/bulk", json=lecturas, headers=auth_headers)
+    assert response.status_code == 201
+    assert [l["temperatura"] for l in response.json()] == [20.0, 21.0, 22.0]
+    
+    response = client.get(f"/api/v1/lecturas/sensor/{sensor_id}/stats", headers=auth_headers)
+    assert response.json()["total_lecturas"] == 3
+    
+    # Un sensor inexistente rechaza el lote completo
+    lecturas.append({"sensor_id": 999999, "temperatura": 20.0, "humedad": 50.0})
+    response = client.post("/api/v1/lecturas/bulk", json=lecturas, headers=auth_headers)
+    assert response.status_code == 400
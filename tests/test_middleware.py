@@ -0,0 +1,94 @@
+"""
+Pruebas para middlewares
+"""
+import asyncio
+
+from core.middleware import SingleFlightMiddleware
+
+def _scope(path="/datos", query=b"a=1&b=2", authorization=b"Bearer x"):
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query,
+        "headers": [(b"authorization", authorization)]
+    }
+
+def _counting_app():
+    """App ASGI que cuenta ejecuciones y tarda un poco en responder"""
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope["path"])
+        await asyncio.sleep(0.01)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    return app, calls
+
+async def _request(middleware, scope):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return messages
+
+def test_single_flight_coalesces_identical_requests():
+    """Test peticiones idénticas concurrentes ejecutan el endpoint una sola vez"""
+    app, calls = _counting_app()
+    middleware = SingleFlightMiddleware(app, paths=["/datos"])
+
+    async def run():
+        return await asyncio.gather(
+            _request(middleware, _scope()),
+            _request(middleware, _scope(query=b"b=2&a=1")),
+            _request(middleware, _scope())
+        )
+
+    responses = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r[-1]["body"] == b"ok" for r in responses)
+    assert middleware.inflight == {}
+
+def test_single_flight_keeps_different_requests_apart():
+    """Test peticiones con distinta query, credencial o ruta no se agrupan"""
+    app, calls = _counting_app()
+    middleware = SingleFlightMiddleware(app, paths=["/datos"])
+
+    async def run():
+        await asyncio.gather(
+            _request(middleware, _scope()),
+            _request(middleware, _scope(query=b"a=2")),
+            _request(middleware, _scope(authorization=b"Bearer y")),
+            _request(middleware, _scope(path="/otros")),
+            _request(middleware, _scope(path="/otros"))
+        )
+
+    asyncio.run(run())
+    assert len(calls) == 5
+
+def test_single_flight_survives_cancelled_follower():
+    """Test cancelar un seguidor no afecta al líder ni a los demás seguidores"""
+    app, calls = _counting_app()
+    middleware = SingleFlightMiddleware(app, paths=["/datos"])
+
+    async def run():
+        leader = asyncio.create_task(_request(middleware, _scope()))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(_request(middleware, _scope())) for _ in range(2)]
+        await asyncio.sleep(0)
+        followers[0].cancel()
+        results = await asyncio.gather(leader, *followers, return_exceptions=True)
+        return results
+
+    leader, cancelled, follower = asyncio.run(run())
+    assert isinstance(cancelled, asyncio.CancelledError)
+    assert leader[-1]["body"] == b"ok"
+    assert follower[-1]["body"] == b"ok"
+    assert len(calls) == 1
+    assert middleware.inflight == {}
@@ -1,6 +1,9 @@
 """
 Pruebas para sensores
 """
+from core.database import SessionLocal
+from models.sensor import Sensor
+from repositories.sensor_repository import sensor_repository
 from schemas.sensor import SensorCreate
 
 def test_create_sensor(client, auth_headers):
@@ -81,3 +84,34 @@ def test_delete_sensor(client, auth_headers):
     # Verificar que no existe
     get_response = client.get(f"/api/v1/sensores/{sensor_id}", headers=auth_headers)
     assert get_response.status_code == 404
+
+def test_update_sensor_not_found(client, auth_headers):
+    """Test actualizar un sensor inexistente"""
+    response = client.put("/api/v1/sensores/999999", json={"modelo": "NADA"}, headers=auth_headers)
+    assert response.status_code == 404
+
+def test_update_sensor_null_field(client, auth_headers):
+    """Test un null explícito en un campo obligatorio se rechaza"""
+    create_response = client.post("/api/v1/sensores/", json={"tipo": "luz", "modelo": "L-NULL"}, headers=auth_headers)
+    sensor_id = create_response.json()["id"]
+    
+    response = client.put(f"/api/v1/sensores/{sensor_id}", json={"modelo": None}, headers=auth_headers)
+    assert response.status_code == 422
+
+def test_db_fixture_rolls_back(db):
+    """Test los commit del repositorio quedan dentro de la transacción del fixture"""
+    sensor = sensor_repository.create(db, tipo="rollback", modelo="RB-1")
+    assert sensor_repository.exists(db, sensor.id)
+    
+    # Otra conexión no ve la fila: el fixture la revertirá al terminar
+    with SessionLocal() as other:
+        assert other.get(Sensor, sensor.id) is None
+
+def test_crud_path_parameters_keep_entity_names(client):
+    """Test las rutas generadas conservan el nombre público del ID (sensor_id, lectura_id...)"""
+    paths = client.get("/openapi.json").json()["paths"]
+    assert "/api/v1/sensores/{sensor_id}" in paths
+    assert "/api/v1/lecturas/{lectura_id}" in paths
+    assert "/api/v1/anomalias/{anomalia_id}" in paths
+    parameters = paths["/api/v1/sensores/{sensor_id}"]["get"]["parameters"]
+    assert [p["name"] for p in parameters if p["in"] == "path"] == ["sensor_id"]
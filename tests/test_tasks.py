@@ -0,0 +1,77 @@
+"""
+Pruebas para la cola de tareas en segundo plano
+"""
+import asyncio
+
+from core.tasks import TaskQueue
+
+def test_task_queue_runs_sync_and_async_tasks():
+    """Test la cola ejecuta funciones síncronas y asíncronas"""
+    results = []
+
+    async def tarea_async(valor):
+        results.append(("async", valor))
+
+    def tarea_sync(valor):
+        results.append(("sync", valor))
+
+    async def run():
+        queue = TaskQueue()
+        queue.start(workers=2)
+        queue.submit(tarea_async, 1)
+        queue.submit(tarea_sync, 2)
+        await queue.stop()
+
+    asyncio.run(run())
+    assert sorted(results) == [("async", 1), ("sync", 2)]
+
+def test_task_queue_coalesces_duplicate_idempotent_tasks():
+    """Test tareas idempotentes idénticas encoladas juntas se ejecutan una sola vez"""
+    calls = []
+
+    async def invalidar(namespace):
+        calls.append(namespace)
+
+    async def run():
+        queue = TaskQueue()
+        queue.start(workers=1)
+        for _ in range(5):
+            queue.submit_idempotent(invalidar, "ubicaciones")
+        queue.submit_idempotent(invalidar, "sensores")
+        await queue.stop()
+
+    asyncio.run(run())
+    assert sorted(calls) == ["sensores", "ubicaciones"]
+
+def test_task_queue_runs_every_regular_task():
+    """Test submit no agrupa tareas: cada llamada se ejecuta"""
+    calls = []
+
+    async def notificar(evento):
+        calls.append(evento)
+
+    async def run():
+        queue = TaskQueue()
+        queue.start(workers=1)
+        for _ in range(3):
+            queue.submit(notificar, "creado")
+        await queue.stop()
+
+    asyncio.run(run())
+    assert calls == ["creado"] * 3
+
+def test_task_queue_runs_tasks_without_workers():
+    """Test sin iniciar la cola las tareas se ejecutan igualmente (sin error)"""
+    results = []
+
+    async def tarea_async(valor):
+        results.append(("async", valor))
+
+    async def run():
+        queue = TaskQueue()
+        queue.submit(tarea_async, 1)
+        queue.submit(results.append, ("sync", 2))
+        await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+    assert sorted(results) == [("async", 1), ("sync", 2)]
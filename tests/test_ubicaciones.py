@@ -22,7 +22,7 @@ def test_create_ubicacion(client, auth_headers):
     assert response.status_code == 201
     data = response.json()
     assert data["sensor_id"] == sensor_id
-    assert data["latitud"] == "10.123456"
+    assert data["latitud"] == 10.123456
     assert data["descripcion"] == "Campo de prueba"
 
 def test_get_ubicaciones_by_sensor(client, auth_headers):
@@ -87,3 +87,231 @@ def test_invalid_coordinates(client, auth_headers):
     response = client.post("/api/v1/ubicaciones/", json=ubicacion_data, headers=auth_headers)
     assert response.status_code == 400
     assert "rango válido" in response.json()["detail"]
+
+def test_update_single_invalid_coordinate(client, auth_headers):
+    """Test actualizar solo una coordenada también valida su rango"""
+    sensor_response = client.post("/api/v1/sensores/", json={"tipo": "gps", "modelo": "GPS-UPD"}, headers=auth_headers)
+    sensor_id = sensor_response.json()["id"]
+    ubicacion_data = {"sensor_id": sensor_id, "latitud": "14.000001", "longitud": "-74.000001"}
+    ubicacion_id = client.post("/api/v1/ubicaciones/", json=ubicacion_data, headers=auth_headers).json()["id"]
+    
+    response = client.put(f"/api/v1/ubicaciones/{ubicacion_id}", json={"latitud": 500}, headers=auth_headers)
+    assert response.status_code == 400
+    assert "rango válido" in response.json()["detail"]
+    
+    response = client.put(f"/api/v1/ubicaciones/{ubicacion_id}", json={"longitud": -74.5}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["latitud"] == 14.000001
+    assert response.json()["longitud"] == -74.5
+
+def test_list_ubicaciones_refreshes_after_create(client, auth_headers):
+    """Test el listado cacheado se invalida al crear una ubicación"""
+    sensor_data = {"tipo": "cache", "modelo": "CACHE-1"}
+    sensor_response = client.post("/api/v1/sensores/", json=sensor_data, headers=auth_headers)
+    sensor_id = sensor_response.json()["id"]
+    
+    # Primera consulta (queda en cache)
+    response = client.get("/api/v1/ubicaciones/?limit=1000", headers=auth_headers)
+    assert response.status_code == 200
+    total_antes = len(response.json())
+    
+    ubicacion_data = {
+        "sensor_id": sensor_id,
+        "latitud": "3.451647",
+        "longitud": "-76.531985",
+        "descripcion": "Parcela cacheada"
+    }
+    client.post("/api/v1/ubicaciones/", json=ubicacion_data, headers=auth_headers)
+    
+    response = client.get("/api/v1/ubicaciones/?limit=1000", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == total_antes + 1
+
+def test_get_nearby_ubicaciones(client, auth_headers):
+    """Test obtener ubicaciones dentro del radio"""
+    sensor_data = {"tipo": "gps", "modelo": "GPS-NEAR"}
+    sensor_response = client.post("/api/v1/sensores/", json=sensor_data, headers=auth_headers)
+    sensor_id = sensor_response.json()["id"]
+    
+    for latitud, longitud, descripcion in [
+        ("20.050000", "-60.050000", "Dentro del radio"),
+        ("20.090000", "-60.090000", "Esquina fuera del radio"),
+        ("25.000000", "-60.000000", "Lejos")
+    ]:
+        client.post("/api/v1/ubicaciones/", json={
+            "sensor_id": sensor_id,
+            "latitud": latitud,
+            "longitud": longitud,
+            "descripcion": descripcion
+        }, headers=auth_headers)
+    
+    response = client.get(
+        "/api/v1/ubicaciones/nearby?latitud=20.0&longitud=-60.0&radio=0.1",
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    descripciones = [u["descripcion"] for u in response.json()]
+    assert descripciones == ["Dentro del radio"]
+
+def test_get_nearby_ubicaciones_invalid_coordinates(client, auth_headers):
+    """Test coordenadas fuera de rango en la búsqueda por cercanía"""
+    response = client.get(
+        "/api/v1/ubicaciones/nearby?latitud=95.0&longitud=-60.0",
+        headers=auth_headers
+    )
+    assert response.status_code == 422
+    
+    response = client.get(
+        "/api/v1/ubicaciones/nearby?latitud=abc&longitud=-60.0",
+        headers=auth_headers
+    )
+    assert response.status_code == 422
+
+def test_get_ubicaciones_keyset_pagination(client, auth_headers):
+    """Test paginación por clave con after_id"""
+    sensor_data = {"tipo": "gps", "modelo": "GPS-PAGE"}
+    sensor_response = client.post("/api/v1/sensores/", json=sensor_data, headers=auth_headers)
+    sensor_id = sensor_response.json()["id"]
+    
+    ids = []
+    for i in range(3):
+        response = client.post("/api/v1/ubicaciones/", json={
+            "sensor_id": sensor_id,
+            "latitud": f"30.00000{i}",
+            "longitud": "-50.000000",
+            "descripcion": f"Página {i}"
+        }, headers=auth_headers)
+        ids.append(response.json()["id"])
+    
+    response = client.get(f"/api/v1/ubicaciones/?after_id={ids[0]}&limit=2", headers=auth_headers)
+    assert response.status_code == 200
+    assert [u["id"] for u in response.json()] == ids[1:]
+
+def test_export_ubicaciones(client, auth_headers):
+    """Test exportación NDJSON de ubicaciones"""
+    import json
+    
+    response = client.get("/api/v1/ubicaciones/?limit=1000", headers=auth_headers)
+    total = len(response.json())
+    
+    response = client.get("/api/v1/ubicaciones/export", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    filas = [json.loads(linea) for linea in response.text.splitlines()]
+    assert len(filas) == total
+    assert all("latitud" in fila for fila in filas)
+
+def test_get_ubicacion_etag(client, auth_headers):
+    """Test ETag y respuesta 304 en el detalle de una ubicación"""
+    sensor_data = {"tipo": "gps", "modelo": "GPS-ETAG"}
+    sensor_response = client.post("/api/v1/sensores/", json=sensor_data, headers=auth_headers)
+    sensor_id = sensor_response.json()["id"]
+    
+    response = client.post("/api/v1/ubicaciones/", json={
+        "sensor_id": sensor_id,
+        "latitud": "40.000000",
+        "longitud": "-40.000000",
+        "descripcion": "Con ETag"
+    }, headers=auth_headers)
+    ubicacion_id = response.json()["id"]
+    
+    response = client.get(f"/api/v1/ubicaciones/{ubicacion_id}", headers=auth_headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    
+    response = client.get(
+        f"/api/v1/ubicaciones/{ubicacion_id}",
+        headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    
+    # Tras modificarla, el ETag anterior ya no es válido
+    client.put(f"/api/v1/ubicaciones/{ubicacion_id}", json={"descripcion": "Modificada"}, headers=auth_headers)
+    response = client.get(
+        f"/api/v1/ubicaciones/{ubicacion_id}",
+        headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["descripcion"] == "Modificada"
+
+def test_list_ubicaciones_refreshes_after_sensor_delete(client, auth_headers):
+    """Test el listado cacheado se invalida al eliminar el sensor (borrado en cascada)"""
+    sensor_data = {"tipo": "cache", "modelo": "CACHE-2"}
+    sensor_response = client.post("/api/v1/sensores/", json=sensor_data, headers=auth_headers)
+    sensor_id = sensor_response.json()["id"]
+    
+    client.post("/api/v1/ubicaciones/", json={
+        "sensor_id": sensor_id,
+        "latitud": "4.710989",
+        "longitud": "-74.072092",
+        "descripcion": "Parcela en cascada"
+    }, headers=auth_headers)
+    
+    response = client.get("/api/v1/ubicaciones/?limit=1000", headers=auth_headers)
+    assert "Parcela en cascada" in [u["descripcion"] for u in response.json()]
+    
+    client.delete(f"/api/v1/sensores/{sensor_id}", headers=auth_headers)
+    
+    response = client.get("/api/v1/ubicaciones/?limit=1000", headers=auth_headers)
+    assert "Parcela en cascada" not in [u["descripcion"] for u in response.json()]
+
+def test_create_ubicaciones_bulk(client, auth_headers):
+    """Test crear varias ubicaciones en una petición"""
+    sensor_data = {"tipo": "gps", "modelo": "GPS-BULK"}
+    sensor_response = client.post("/api/v1/sensores/", json=sensor_data, headers=auth_headers)
+    sensor_id = sensor_response.json()["id"]
+    
+    ubicaciones = [
+        {"sensor_id": sensor_id, "latitud": "11.000001", "longitud": "-71.000001", "descripcion": "Lote 1"},
+        {"sensor_id": sensor_id, "latitud": "11.000002", "longitud": "-71.000002", "descripcion": "Lote 2"}
+    ]
+    response = client.post("/api/v1/ubicaciones/bulk", json=ubicaciones, headers=auth_headers)
+    assert response.status_code == 201
+    data = response.json()
+    assert [u["descripcion"] for u in data] == ["Lote 1", "Lote 2"]
+    assert all(u["id"] for u in data)
+    
+    # Repetir el lote falla: las coordenadas ya existen
+    response = client.post("/api/v1/ubicaciones/bulk", json=ubicaciones, headers=auth_headers)
+    assert response.status_code == 400
+
+def test_create_ubicaciones_bulk_missing_sensor(client, auth_headers):
+    """Test el lote se rechaza completo si un sensor no existe"""
+    ubicaciones = [
+        {"sensor_id": 999999, "latitud": "12.000001", "longitud": "-72.000001", "descripcion": "Sin sensor"}
+    ]
+    response = client.post("/api/v1/ubicaciones/bulk", json=ubicaciones, headers=auth_headers)
+    assert response.status_code == 400
+    assert "999999" in response.json()["detail"]
+
+def test_create_ubicacion_after_sensor_deleted(client, auth_headers):
+    """Test la existencia cacheada del sensor se olvida al eliminarlo"""
+    sensor_response = client.post("/api/v1/sensores/", json={"tipo": "gps", "modelo": "GPS-DEL"}, headers=auth_headers)
+    sensor_id = sensor_response.json()["id"]
+    
+    ubicacion_data = {"sensor_id": sensor_id, "latitud": "13.000001", "longitud": "-73.000001"}
+    response = client.post("/api/v1/ubicaciones/", json=ubicacion_data, headers=auth_headers)
+    assert response.status_code == 201
+    
+    client.delete(f"/api/v1/sensores/{sensor_id}", headers=auth_headers)
+    ubicacion_data["latitud"] = "13.000002"
+    response = client.post("/api/v1/ubicaciones/", json=ubicacion_data, headers=auth_headers)
+    assert response.status_code == 400
+
+def test_upgrade_schema_creates_coordinates_index(tmp_path):
+    """Test upgrade_schema añade el índice de coordenadas a una tabla existente"""
+    from sqlalchemy import create_engine, inspect, text
+    from core.database import upgrade_schema
+    
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE ubicaciones (id INTEGER PRIMARY KEY, sensor_id INTEGER, "
+            "latitud VARCHAR, longitud VARCHAR, descripcion VARCHAR)"
+        ))
+    
+    upgrade_schema(bind=engine)
+    upgrade_schema(bind=engine)  # idempotente
+    
+    indexes = {index["name"] for index in inspect(engine).get_indexes("ubicaciones")}
+    assert "ix_ubicaciones_latitud_longitud" in indexes